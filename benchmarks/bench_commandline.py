@@ -0,0 +1,97 @@
+"""Compare the commandline engines of `colt.commandline`
+
+Measures the startup, i.e. a fresh interpreter importing colt, building the
+parser and parsing the arguments, and the parse latency within a running
+process for a question set with 500 options.
+
+    python benchmarks/bench_commandline.py [--noptions 500] [--repeat 5] [--json out.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import timeit
+from statistics import median
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ENGINES = ('colt', 'argparse')
+
+
+def make_questions(noptions):
+    """question set with `noptions` options and a single positional argument"""
+    lines = ["natoms = :: int"]
+    lines += [f"option{i} = {i} :: int" for i in range(noptions)]
+    return "\n".join(lines)
+
+
+def make_args(noptions):
+    """commandline arguments, setting every tenth option"""
+    args = ["10"]
+    for i in range(0, noptions, 10):
+        args += [f"-option{i}", str(2*i)]
+    return args
+
+
+STARTUP = """
+import time
+start = time.perf_counter()
+from colt.commandline import get_config_from_commandline
+from benchmarks.bench_commandline import make_questions, make_args
+get_config_from_commandline(make_questions({noptions}), args=make_args({noptions}),
+                            engine='{engine}')
+print(time.perf_counter() - start)
+"""
+
+
+def startup_time(engine, noptions, repeat):
+    """median time of a fresh interpreter to import colt and parse the arguments"""
+    code = STARTUP.format(engine=engine, noptions=noptions)
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                                capture_output=True, text=True)
+        times.append(float(output.stdout.split()[-1]))
+    return median(times)
+
+
+def parse_time(engine, noptions, repeat):
+    """median time to build the parser and parse the arguments"""
+    from colt.commandline import get_config_from_commandline
+    questions = make_questions(noptions)
+    args = make_args(noptions)
+
+    def run():
+        get_config_from_commandline(questions, args=args, engine=engine)
+
+    return median(timeit.repeat(run, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--noptions', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', default=None, help="write the results to this file")
+    args = parser.parse_args()
+    #
+    results = {}
+    for engine in ENGINES:
+        results[engine] = {
+            'startup': startup_time(engine, args.noptions, args.repeat),
+            'parse': parse_time(engine, args.noptions, args.repeat),
+        }
+    #
+    print(f"{'engine':>10} {'startup [ms]':>14} {'parse [ms]':>12}")
+    for engine, result in results.items():
+        print(f"{engine:>10} {1000*result['startup']:14.2f} {1000*result['parse']:12.2f}")
+    #
+    if args.json is not None:
+        with open(args.json, 'w') as fhandle:
+            json.dump({'noptions': args.noptions, 'results': results}, fhandle, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,344 @@
+"""Benchmarks of colt's hot paths
+
+Every benchmark is run for synthetic inputs of the given sizes, the results
+(best time per call in seconds) can be written as json and compared to a
+baseline, a slowdown above the threshold is reported as regression and the
+suite exits with status 1.
+
+    python -m benchmarks.suite [--sizes 10,1000,100000] [--filter qform]
+                               [--json results.json] [--baseline baseline.json]
+                               [--threshold 1.25]
+"""
+import argparse
+import glob
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import timeit
+from collections import namedtuple
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from colt.questions import QuestionASTGenerator  # noqa: E402
+from colt.qform import QuestionForm  # noqa: E402
+from colt.parser import CommandlineParserVisitor, HelpFormatter, SysIterator  # noqa: E402
+from colt.pluginloader import IgnorePattern, PluginLoader, clear_module_cache  # noqa: E402
+
+
+SIZES = (10, 1000, 100000)
+
+Benchmark = namedtuple("Benchmark", ("name", "setup", "max_size"))
+BENCHMARKS = {}
+
+
+def benchmark(name, *, max_size=None):
+    """Register a benchmark, `setup(size, tmpdir)` returns the function to be timed"""
+
+    def _wrapper(setup):
+        BENCHMARKS[name] = Benchmark(name, setup, max_size)
+        return setup
+
+    return _wrapper
+
+
+def make_questions(size, *, block_size=100):
+    """question set with `size` questions, in blocks of `block_size` questions"""
+    lines = []
+    for i in range(size):
+        if i % block_size == 0 and i != 0:
+            lines.append(f"[block{i // block_size}]")
+        lines.append(f"value{i} = {i} :: int")
+    return "\n".join(lines)
+
+
+def make_tree_questions(size, *, branching=2):
+    """question set of nested subquestion blocks with about `size` cases"""
+    depth = max(1, round(math.log(size, branching)))
+    lines = []
+    parents = ['']
+    for level in range(depth):
+        children = []
+        for parent in parents:
+            for case in range(branching):
+                block = f"l{level}(c{case})"
+                if parent != '':
+                    block = f"{parent}::{block}"
+                lines += [f"[{block}]", f"value = {case} :: int"]
+                children.append(block)
+        parents = children
+    return "\n".join(lines)
+
+
+def make_argv(size):
+    """commandline arguments setting every tenth question of the first block"""
+    args = []
+    for i in range(0, min(size, 100), 10):
+        args += [f"--value{i}", str(2*i)]
+    return args
+
+
+@benchmark("ast_parse")
+def bench_ast_parse(size, tmpdir):
+    questions = make_questions(size)
+    return lambda: QuestionASTGenerator(questions)
+
+
+@benchmark("qform_build")
+def bench_qform_build(size, tmpdir):
+    questions = make_questions(size)
+    return lambda: QuestionForm(questions)
+
+
+@benchmark("qform_build_tree", max_size=10000)
+def bench_qform_build_tree(size, tmpdir):
+    questions = make_tree_questions(size)
+    return lambda: QuestionForm(questions)
+
+
+@benchmark("set_answers_from_file")
+def bench_set_answers_from_file(size, tmpdir):
+    qform = QuestionForm(make_questions(size))
+    filename = os.path.join(tmpdir, 'config.ini')
+    qform.write_config(filename)
+    return lambda: qform.set_answers_from_file(filename)
+
+
+@benchmark("get_answers")
+def bench_get_answers(size, tmpdir):
+    qform = QuestionForm(make_questions(size))
+    return qform.get_answers
+
+
+@benchmark("write_config")
+def bench_write_config(size, tmpdir):
+    qform = QuestionForm(make_questions(size))
+    filename = os.path.join(tmpdir, 'config.ini')
+    return lambda: qform.write_config(filename)
+
+
+@benchmark("parser_build")
+def bench_parser_build(size, tmpdir):
+    qform = QuestionForm(make_questions(size))
+    return lambda: CommandlineParserVisitor(HelpFormatter()).visit(qform)
+
+
+@benchmark("parser_build_tree", max_size=10000)
+def bench_parser_build_tree(size, tmpdir):
+    qform = QuestionForm(make_tree_questions(size))
+    return lambda: CommandlineParserVisitor(HelpFormatter()).visit(qform)
+
+
+@benchmark("argv_parse")
+def bench_argv_parse(size, tmpdir):
+    parser = CommandlineParserVisitor(HelpFormatter()).visit(QuestionForm(make_questions(size)))
+    argv = make_argv(size)
+
+    def _parse():
+        parser.reset()
+        parser.get_answers(args=SysIterator(argv))
+
+    return _parse
+
+
+@benchmark("plugin_loader", max_size=1000)
+def bench_plugin_loader(size, tmpdir):
+    folder = os.path.join(tmpdir, 'plugins')
+    os.mkdir(folder)
+    for i in range(size):
+        with open(os.path.join(folder, f"plugin{i}.py"), 'w') as fhandle:
+            fhandle.write(f"VALUE = {i}\n")
+
+    def _load():
+        clear_module_cache()
+        PluginLoader(folder)
+
+    return _load
+
+
+@benchmark("plugin_loader_cached", max_size=1000)
+def bench_plugin_loader_cached(size, tmpdir):
+    folder = os.path.join(tmpdir, 'plugins')
+    make_plugin_tree(folder, size)
+    PluginLoader(folder)
+    return lambda: PluginLoader(folder)
+
+
+def make_plugin_tree(folder, size, *, per_folder=50):
+    """nested plugin folder with `size` files of about 100 lines each"""
+    body = "\n".join(f"def func{j}(x):\n    return x + {j}\n" for j in range(50))
+    for i in range(size):
+        subfolder = os.path.join(folder, f"group{i // per_folder}")
+        os.makedirs(subfolder, exist_ok=True)
+        with open(os.path.join(subfolder, f"plugin{i}.py"), 'w') as fhandle:
+            fhandle.write(f"VALUE = {i}\n{body}")
+
+
+@benchmark("plugin_discovery", max_size=10000)
+def bench_plugin_discovery(size, tmpdir):
+    folder = os.path.join(tmpdir, 'plugins')
+    make_plugin_tree(folder, size)
+    loader = PluginLoader(os.path.join(tmpdir, 'empty'))
+    return lambda: list(loader._find_modules(folder))
+
+
+def _bench_plugin_import(size, tmpdir, processes):
+    folder = os.path.join(tmpdir, 'plugins')
+    make_plugin_tree(folder, size)
+
+    def _import():
+        # cold start, the bytecode has to be compiled again
+        for pycache in glob.glob(os.path.join(folder, '*', '__pycache__')):
+            shutil.rmtree(pycache)
+        clear_module_cache()
+        PluginLoader(folder, processes=processes)
+
+    return _import
+
+
+@benchmark("plugin_import", max_size=1000)
+def bench_plugin_import(size, tmpdir):
+    return _bench_plugin_import(size, tmpdir, None)
+
+
+@benchmark("plugin_import_parallel", max_size=1000)
+def bench_plugin_import_parallel(size, tmpdir):
+    return _bench_plugin_import(size, tmpdir, os.cpu_count())
+
+
+@benchmark("ignore_pattern")
+def bench_ignore_pattern(size, tmpdir):
+    with open(os.path.join(tmpdir, '.coltignore'), 'w') as fhandle:
+        for i in range(20):
+            fhandle.write(f"unused{i}_*.py\n**/skip{i}\n**/group{i}/old{i}.py\n")
+        fhandle.write("!unused0_keep.py\n")
+    ignore = IgnorePattern(tmpdir, '.coltignore')
+    paths = [os.path.join(tmpdir, f"group{i % 50}", f"plugin{i}.py") for i in range(size)]
+
+    def _ignore():
+        for path in paths:
+            ignore(path)
+
+    return _ignore
+
+
+@benchmark("lazy_imports_import", max_size=10000)
+def bench_lazy_imports_import(size, tmpdir):
+    filename = os.path.join(tmpdir, 'lazy_plugins.py')
+    with open(filename, 'w') as fhandle:
+        fhandle.write("from colt import Colt\nfrom colt.lazyimport import LazyImporter\n")
+        for i in range(size):
+            fhandle.write(f"\n\nclass Lazy{i}(Colt):\n"
+                          f"    _lazy_imports = LazyImporter({{'np': 'numpy', 'math': None}})\n")
+
+    def _import():
+        clear_module_cache()
+        PluginLoader.import_path(filename)
+
+    return _import
+
+
+@benchmark("plugin_resolve")
+def bench_plugin_resolve(size, tmpdir):
+    from colt.plugins import PluginStorage
+    storage = PluginStorage({f"Method{i}": i for i in range(size)})
+    keys = [f"method{i}" for i in range(0, size, max(1, size // 100))]
+
+    def _resolve():
+        for key in keys:
+            storage.resolve(key)
+
+    return _resolve
+
+
+@benchmark("workflow_run", max_size=10000)
+def bench_workflow_run(size, tmpdir):
+    from colt.workflow import WorkflowGenerator
+    engine = WorkflowGenerator()
+
+    @engine.register_action
+    def add(a: 'int', b: 'int') -> 'int':
+        return a + b
+
+    nodes = ["c0 = add(a, b)"] + [f"c{i} = add(c{i-1}, b)" for i in range(1, size)]
+    workflow = engine.create_workflow('bench', "\n".join(nodes))
+    return lambda: workflow.run({'a': 1, 'b': 2})
+
+
+def time_function(func, *, min_time=0.2, repeat=3):
+    """best time per call, the number of calls per repetition is chosen to take `min_time`"""
+    timer = timeit.Timer(func)
+    duration = timer.timeit(number=1)
+    number = max(1, int(min_time / max(duration, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_benchmarks(sizes=SIZES, *, names=None, min_time=0.2, repeat=3, verbose=True):
+    """Run the benchmarks, returns {"name[size]": seconds per call}"""
+    results = {}
+    for benchmark in BENCHMARKS.values():
+        if names is not None and not any(name in benchmark.name for name in names):
+            continue
+        for size in sizes:
+            if benchmark.max_size is not None and size > benchmark.max_size:
+                continue
+            tmpdir = tempfile.mkdtemp()
+            try:
+                func = benchmark.setup(size, tmpdir)
+                key = f"{benchmark.name}[{size}]"
+                results[key] = time_function(func, min_time=min_time, repeat=repeat)
+            finally:
+                shutil.rmtree(tmpdir)
+            if verbose:
+                print(f"{key:<32} {1000*results[key]:12.4f} ms", flush=True)
+    return results
+
+
+def find_regressions(results, baseline, threshold):
+    """Return {"name[size]": ratio} for all results slower than threshold*baseline"""
+    return {key: value / baseline[key] for key, value in results.items()
+            if key in baseline and value > threshold * baseline[key]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default=",".join(str(size) for size in SIZES),
+                        help="comma separated sizes")
+    parser.add_argument('--filter', action='append', default=None,
+                        help="only run benchmarks that contain this string")
+    parser.add_argument('--min-time', type=float, default=0.2,
+                        help="minimum time per repetition in seconds")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--json', default=None, help="write the results to this file")
+    parser.add_argument('--baseline', default=None, help="json file of a previous run")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="allowed slowdown relative to the baseline")
+    args = parser.parse_args()
+    #
+    sizes = tuple(int(size) for size in args.sizes.split(','))
+    results = run_benchmarks(sizes, names=args.filter, min_time=args.min_time,
+                             repeat=args.repeat)
+    #
+    if args.json is not None:
+        with open(args.json, 'w') as fhandle:
+            json.dump({'python': platform.python_version(), 'results': results},
+                      fhandle, indent=4)
+    #
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as fhandle:
+            baseline = json.load(fhandle)['results']
+        regressions = find_regressions(results, baseline, args.threshold)
+        for key, ratio in regressions.items():
+            print(f"Regression: {key} is {ratio:.2f}x slower than the baseline")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,13 +6,37 @@ __author__ = """Maximilian Menger"""
 __email__ = 'm.f.s.j.menger@rug.nl'
 __version__ = '0.6.0'
 
-__all__ = ["Colt", "Plugin", "PluginLoader", "from_commandline", "Validator", "NOT_DEFINED"]
-
-# Helper class to handle easily questions with classes
-from .colt import Colt
-from .plugins import Plugin
-from .pluginloader import PluginLoader
-# Decorator to call functions with commandline arguments
-from .colt import from_commandline
-# Validator
-from .validator import Validator, NOT_DEFINED
+__all__ = ["Colt", "Plugin", "PluginLoader", "from_commandline", "Validator", "NOT_DEFINED",
+           "memory_report"]
+
+from importlib import import_module
+
+
+# the public objects are imported on first access (PEP 562),
+# so only the used subsystems are loaded, {name: module}
+_LAZY_ATTRIBUTES = {
+    # Helper class to handle easily questions with classes
+    'Colt': '.colt',
+    'Plugin': '.plugins',
+    'PluginLoader': '.pluginloader',
+    # Decorator to call functions with commandline arguments
+    'from_commandline': '.colt',
+    # Validator
+    'Validator': '.validator',
+    'NOT_DEFINED': '.validator',
+    # Memory footprint of questions, forms and answers
+    'memory_report': '.memory',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
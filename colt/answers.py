@@ -1,39 +1,308 @@
 """Storage for Answers in Colts Questions Module"""
-from collections.abc import Mapping
+from collections.abc import Mapping, MutableMapping
+from functools import lru_cache
+from types import MappingProxyType
+from weakref import WeakValueDictionary
+#
+from .generator import GeneratorNavigator
+
+
+class AnswersSchema:
+    """Key layout of an answers block, shared by all blocks with the same keys
+
+    The schemas are cached, so all answers generated from the same question set
+    reference the same schema and only store a flat list of values.
+    """
+
+    __slots__ = ('keys', 'index', '__weakref__')
+    # all schemas in use, unused schemas are dropped
+    _schemas = WeakValueDictionary()
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = {key: i for i, key in enumerate(keys)}
+
+    @classmethod
+    def from_keys(cls, keys):
+        """return the shared schema for the given keys"""
+        keys = tuple(keys)
+        schema = cls._schemas.get(keys)
+        if schema is None:
+            schema = cls._schemas[keys] = cls(keys)
+        return schema
+
+    def extend(self, keys):
+        """return the shared schema extended by the new keys"""
+        return self.from_keys(self.keys + tuple(key for key in keys if key not in self.index))
+
+    def __reduce__(self):
+        return (self.from_keys, (self.keys,))
+
+    def __repr__(self):
+        return f"AnswersSchema({self.keys})"
+
+
+@lru_cache(maxsize=1024)
+def split_path(path):
+    """split a path `a::b(case)::c` into a tuple of (key, case) pairs,
+    case is None for normal keys"""
+    out = []
+    for node in path.split(GeneratorNavigator.seperator):
+        branch = GeneratorNavigator.get_branching(node)
+        if branch is None:
+            out.append((node, None))
+        else:
+            out.append((branch.branch, branch.node))
+    return tuple(out)
 
 
 class AnswersBlock(Mapping):
-    """Simple Mapping used to store an answers block"""
+    """Compact Mapping used to store an answers block,
+    the keys are stored in a shared `AnswersSchema`, the values in a flat list"""
+
+    __slots__ = ('_schema', '_values')
 
     def __init__(self, dct=None):
         if dct is None:
             dct = {}
-        self._data = dct
+        self._schema = AnswersSchema.from_keys(dct)
+        self._values = list(dct.values())
+
+    @classmethod
+    def from_schema(cls, schema, values):
+        """create a block from an existing schema and the corresponding values"""
+        if len(schema.keys) != len(values):
+            raise ValueError("Number of values does not match the schema")
+        block = cls.__new__(cls)
+        block._schema = schema
+        block._values = list(values)
+        return block
+
+    @property
+    def schema(self):
+        """shared key layout of the block"""
+        return self._schema
 
     def __getitem__(self, key):
-        return self._data[key]
+        return self._values[self._schema.index[key]]
+
+    def __contains__(self, key):
+        return key in self._schema.index
 
     def __iter__(self):
-        return iter(self._data)
+        return iter(self._schema.keys)
 
     def __len__(self):
-        return len(self._data)
+        return len(self._values)
+
+    def get(self, key, default=None):
+        idx = self._schema.index.get(key)
+        if idx is None:
+            return default
+        return self._values[idx]
+
+    def __repr__(self):
+        return f"AnswersBlock({dict(zip(self._schema.keys, self._values))})"
 
     def update(self, dct):
         """update mapping"""
-        self._data.update(dct)
+        index = self._schema.index
+        new = {}
+        for key, value in dct.items():
+            idx = index.get(key)
+            if idx is None:
+                new[key] = value
+            else:
+                self._values[idx] = value
+        if len(new) != 0:
+            self._schema = self._schema.extend(new)
+            self._values.extend(new.values())
+
+    def get_path(self, path):
+        """Get an answer by its full path, e.g. `a::b(case)::c`
+
+        Raises
+        ------
+        KeyError
+            if the path does not exist, or a case is not the selected one
+        """
+        value = self
+        try:
+            for key, case in split_path(path):
+                value = value[key]
+                if case is not None:
+                    if value != case:
+                        raise KeyError(path)
+                    value = value.subquestion_answers
+        except (KeyError, TypeError):
+            raise KeyError(path) from None
+        return value
+
+    def as_mapping_proxy(self):
+        """Return a read-only view of the block, no data is copied"""
+        return MappingProxyType(self)
+
+    def diff(self, other):
+        """Return the structural difference to the answers in `other`,
+        see `diff_answers`"""
+        return diff_answers(self, other)
+
+    def to_dict(self, *, lazy=False):
+        """convert to dict
+
+        Parameters
+        ----------
+        lazy: bool, optional
+            if True, nested blocks are only converted once they are accessed,
+            see `LazyAnswersDict`
+        """
+        if lazy is True:
+            return LazyAnswersDict(zip(self._schema.keys, self._values))
+        return {name: value if not isinstance(value, AnswersBlock) else value.to_dict()
+                for name, value in zip(self._schema.keys, self._values)}
+
+
+class LazyAnswersDict(MutableMapping):
+    """Mutable mapping of answers, that converts nested `AnswersBlock`
+    into `LazyAnswersDict` on access
 
-    def to_dict(self):
-        """convert to dict"""
-        return dict((name, value)
-                    if not isinstance(value, AnswersBlock)
-                    else (name, value.to_dict())
-                    for name, value in self.items())
+    Note
+    ----
+    It is not a dict subclass, so that C level consumers (`dict(x)`, `{**x}`)
+    use the converting `__getitem__`. `json.dumps` only serializes dicts,
+    use `json.dumps(x, default=dict)` or `AnswersBlock.to_dict()` instead.
+    """
+
+    __slots__ = ('_data', )
+
+    def __init__(self, *args, **kwargs):
+        self._data = dict(*args, **kwargs)
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if isinstance(value, AnswersBlock):
+            value = self._data[key] = value.to_dict(lazy=True)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __repr__(self):
+        return f"LazyAnswersDict({self._data})"
+
+    def copy(self):
+        return LazyAnswersDict(self._data)
+
+
+class AnswersDiff:
+    """Structural difference between two answer trees, all entries are
+    stored by their full path, e.g. `a::b(case)::c`"""
+
+    __slots__ = ('added', 'removed', 'changed')
+
+    def __init__(self):
+        # path: new value
+        self.added = {}
+        # path: old value
+        self.removed = {}
+        # path: (old value, new value)
+        self.changed = {}
+
+    def __bool__(self):
+        return any(len(entries) != 0 for entries in (self.added, self.removed, self.changed))
+
+    def __repr__(self):
+        return f"AnswersDiff(added={self.added}, removed={self.removed}, changed={self.changed})"
+
+
+def diff_answers(old, new):
+    """Compare two answer trees without copying them
+
+    Parameters
+    ----------
+    old, new: Mapping
+        answers, e.g. generated by `QuestionForm.get_answers`
+
+    Returns
+    -------
+    AnswersDiff
+        added, removed and changed entries, selected cases of subquestions
+        are part of the path, e.g. `a::b(case)::c`
+    """
+    diff = AnswersDiff()
+    _diff_blocks(old, new, "", diff)
+    return diff
+
+
+def _diff_blocks(old, new, prefix, diff):
+    """compare two blocks"""
+    join_keys = GeneratorNavigator.join_keys
+    for key, value in old.items():
+        path = join_keys(prefix, key)
+        if key not in new:
+            diff.removed[path] = value
+            continue
+        _diff_values(value, new[key], path, diff)
+    #
+    for key, value in new.items():
+        if key not in old:
+            diff.added[join_keys(prefix, key)] = value
+
+
+def _diff_values(old, new, path, diff):
+    """compare two values"""
+    if isinstance(old, SubquestionsAnswer) and isinstance(new, SubquestionsAnswer):
+        join_case = GeneratorNavigator.join_case
+        if old.value == new.value:
+            _diff_blocks(old.subquestion_answers, new.subquestion_answers,
+                         join_case(path, old.value), diff)
+            return
+        diff.changed[path] = (old.value, new.value)
+        if old.value is not None:
+            diff.removed[join_case(path, old.value)] = old.subquestion_answers
+        if new.value is not None:
+            diff.added[join_case(path, new.value)] = new.subquestion_answers
+        return
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        _diff_blocks(old, new, path, diff)
+        return
+    if not _is_equal(old, new):
+        diff.changed[path] = (old, new)
+
+
+def _is_equal(value1, value2):
+    """check equality, supports also numpy arrays"""
+    if type(value1) is not type(value2):
+        return False
+    try:
+        result = value1 == value2
+    except ValueError:
+        return False
+    if isinstance(result, bool):
+        return result
+    # numpy arrays
+    if getattr(value1, 'shape', None) != getattr(value2, 'shape', None):
+        return False
+    return bool(result.all())
 
 
 class SubquestionsAnswer(Mapping):
     """Storage elemement for the answers of a subquestion"""
 
+    __slots__ = ('name', '_main_answer', '_subquestion_answers', 'is_subquestion')
+
     def __init__(self, name, main_answer, subquestion_answers):
         """A subquestion answer object
         Parameters
@@ -1,15 +1,20 @@
 """Provides the `Colt` class to use the questions functionality"""
 from abc import ABCMeta
+from weakref import WeakKeyDictionary
 #
 from .questions import QuestionASTGenerator
-from .ask import AskQuestions
 from .parser import get_config_from_commandline, get_commandline_parser
 from .lazyimport import LazyImporter
+from .profiler import profile
 
 
 __all__ = ("Colt",)
 
 
+# cached commandline parsers, cls: {(fingerprint, description, presets): parser}
+_COMMANDLINE_PARSERS = WeakKeyDictionary()
+
+
 class ClassProperty:
 
     def __init__(self, func):
@@ -58,13 +63,17 @@ def to_classmethod(clsdict, function_name):
             clsdict[function_name] = classmethod(func)
 
 
+def no_extend_user_input(cls, questions):
+    """Default `_extend_user_input`, does not extend the questions"""
+
+
 def colt_modify_class_dict(clsdict, bases):
     """setup the clsdict in colt to avoid inheritance problems
 
        it modifies both the clsdict and its annotations!
     """
     colt_defaults = {
-            '_extend_user_input': classmethod(lambda cls, questions: None),
+            '_extend_user_input': classmethod(no_extend_user_input),
             '_user_input': "",
             '_colt_description': None,
             '_lazy_imports': None,
@@ -110,19 +119,27 @@ class ColtMeta(ABCMeta):
 
     def __new__(cls, name, bases, clsdict):
         """Modify clsdict before the new method of the metaclass is called"""
-        colt_modify_class_dict(clsdict, bases)
-        return ABCMeta.__new__(cls, name, bases, clsdict)
+        with profile(name, 'class', module=clsdict.get('__module__')):
+            colt_modify_class_dict(clsdict, bases)
+            return ABCMeta.__new__(cls, name, bases, clsdict)
 
     def generate_user_input_ast(cls):
         """gentarte QuestionAST object and extend it possibly"""
-        main_description = getattr(cls, '_colt_description')
-        questions = QuestionASTGenerator(cls._user_input, comment=main_description)
-        cls._extend_user_input(questions)
-        return questions
+        with profile(cls.__name__, 'questions', module=cls.__module__):
+            main_description = getattr(cls, '_colt_description')
+            questions = QuestionASTGenerator(cls._user_input, comment=main_description)
+            cls._extend_user_input(questions)
+            return questions
 
     def _extend_user_input(cls, questions):
         """In case additional questions should be added to the QuesionAST"""
 
+    def _colt_fingerprint(cls):
+        """Hashable key of all inputs used to generate the questions of the class,
+        if it does not change, the questions can be reused"""
+        extend_user_input = getattr(cls._extend_user_input, '__func__', cls._extend_user_input)
+        return (cls._user_input, cls._colt_description, extend_user_input)
+
 
 class Colt(metaclass=ColtMeta):
     """Base Class for `Colt` classes"""
@@ -147,6 +164,8 @@ class Colt(metaclass=ColtMeta):
         AskQuestions
             object to generate the questions config
         """
+        # ask sets up readline, only import it if questions are asked
+        from .ask import AskQuestions
         return AskQuestions(cls.colt_user_input, config=config, presets=presets)
 
     @classmethod
@@ -220,7 +239,8 @@ class Colt(metaclass=ColtMeta):
                         "also from_questions depend on that!")
 
     @classmethod
-    def from_commandline(cls, *args, presets=None, as_parser=False, description=None, **kwargs):
+    def from_commandline(cls, *args, presets=None, as_parser=False, description=None,
+                         prefetch=False, **kwargs):
         """Initialize the class using input provided from the commandline
 
         Parameters
@@ -233,6 +253,11 @@ class Colt(metaclass=ColtMeta):
         presets: str, optional
             presets for the questions
 
+        prefetch: bool, optional
+            if True, the `_lazy_imports` of the class, and of the plugins
+            selected on the commandline, are imported in a background thread
+            while the remaining arguments are parsed and validated
+
         args, kwargs: optional
             arguments and keyword arguments passed to from_config aside from
             the questions config
@@ -244,11 +269,50 @@ class Colt(metaclass=ColtMeta):
             so from_config should return an instance of the class.
         """
         if as_parser is False:
-            answers = get_config_from_commandline(cls.colt_user_input, description=description,
-                                                  presets=presets)
+            parser = cls._get_commandline_parser(description=description, presets=presets)
+            if prefetch is False:
+                answers = parser.get_answers()
+            else:
+                with parser.on_case_selected(LazyImportsPrefetcher(cls)):
+                    answers = parser.get_answers()
             return cls._from_config(answers, *args, **kwargs)
         return CommandlineClassInterface(cls, description=description, presets=presets)
 
+    @classmethod
+    def _get_commandline_parser(cls, description=None, presets=None):
+        """Return the commandline parser of the class
+
+        The parser is cached per class and question fingerprint, a cached
+        parser is reset, so that only the answers need to be parsed again.
+        """
+        try:
+            key = (cls._colt_fingerprint(), description, presets)
+            hash(key)
+        except TypeError:
+            # unhashable settings, do not cache
+            return cls._create_commandline_parser(description=description, presets=presets)
+        #
+        parsers = _COMMANDLINE_PARSERS.get(cls)
+        if parsers is None:
+            parsers = _COMMANDLINE_PARSERS[cls] = {}
+        #
+        parser = parsers.get(key)
+        if parser is not None:
+            parser.reset()
+            return parser
+        # questions changed, remove outdated parsers
+        for outdated in [old for old in parsers if old[0] != key[0]]:
+            del parsers[outdated]
+        parser = parsers[key] = cls._create_commandline_parser(description=description,
+                                                               presets=presets)
+        return parser
+
+    @classmethod
+    def _create_commandline_parser(cls, description=None, presets=None):
+        """Create a new commandline parser for the questions of the class"""
+        return get_commandline_parser(cls.colt_user_input, description=description,
+                                      presets=presets)
+
     @classmethod
     def generate_input(cls, filename, *, config=None, presets=None,
                        ask_all=False, ask_defaults=True):
@@ -318,6 +382,57 @@ class Colt(metaclass=ColtMeta):
         cls._lazy_imports = None
 
 
+def _get_loaded_attr(obj, name, default=None):
+    """getattr for Colt classes and their placeholders (e.g. `LazyPlugin`),
+    attributes missing on a placeholder are not looked up in the class,
+    as that would load it"""
+    if isinstance(obj, type):
+        return getattr(obj, name, default)
+    try:
+        return object.__getattribute__(obj, name)
+    except AttributeError:
+        return default
+
+
+def prefetch_lazy_imports(obj):
+    """Start importing the `_lazy_imports` of a Colt class in the background,
+    plugins that are not loaded yet are skipped"""
+    lazy_imports = _get_loaded_attr(obj, '_lazy_imports')
+    if lazy_imports is not None:
+        lazy_imports.prefetch()
+
+
+class LazyImportsPrefetcher:
+    """Hook for `MainArgumentParser.on_case_selected`, prefetches the lazy imports
+    of the class and of every plugin selected on the commandline
+
+    A case selects a plugin of a factory, if the cases of the subparser
+    are the plugins of the factory.
+    """
+
+    __slots__ = ('factories',)
+
+    def __init__(self, cls):
+        prefetch_lazy_imports(cls)
+        self.factories = [cls]
+
+    def __call__(self, subparser, case):
+        cases = None
+        for factory in self.factories:
+            plugins = getattr(factory, 'plugins', None)
+            if not isinstance(plugins, dict) or case not in plugins:
+                continue
+            if cases is None:
+                cases = {option.name for option in subparser.iter_cases()}
+            if cases != plugins.keys():
+                continue
+            plugin = plugins[case]
+            prefetch_lazy_imports(plugin)
+            if _get_loaded_attr(plugin, '_is_plugin_factory', False) is True:
+                self.factories.append(plugin)
+            return
+
+
 class CommandlineInterface:
 
     def __init__(self, description, name):
@@ -379,6 +494,10 @@ class CommandlineClassInterface(CommandlineInterface):
     def colt_user_input(self):
         return self._cls.colt_user_input
 
+    def get_parser(self):
+        return self._cls._get_commandline_parser(description=self.description,
+                                                 presets=self._presets)
+
     def __call__(self, *args, **kwargs):
         """If the function is called with arguments: use it as is
         Else: get the arguments from the commandline"""
@@ -0,0 +1,872 @@
+"""Generate shell completion scripts from Colt's commandline parsers
+
+The parser tree is flattened into a `CompletionTable`, which is written as
+static lookup tables into bash, zsh or fish scripts, so no python process is
+started during completion.
+
+For choices that are only known at runtime, e.g. plugin names, the table can
+be kept resident in a `CompletionServer` listening on a unix socket. Scripts
+generated with `socket=path` query the server with socat first and fall back
+to their static tables when it is not running or socat is not available.
+"""
+import os
+import re
+import socket
+import socketserver
+import threading
+from abc import ABC, abstractmethod
+from collections import namedtuple
+#
+from .parser import ArgumentParser, EventAction, HelpFormatter
+from .parser import CommandlineParserVisitor, get_commandline_parser, is_number
+from .qform import QuestionForm
+
+
+__all__ = ["CompletionTable", "CompletionServer", "completion_script", "get_completion_table",
+           "request_completion", "serve_completion"]
+
+
+# nargs: int or '+', kind: n (nothing), f (file), d (folder), w (words), words: tuple
+ArgInfo = namedtuple("ArgInfo", ("nargs", "kind", "words"))
+# candidates for the current word, files: None, 'f' (files) or 'd' (folders)
+CompletionResult = namedtuple("CompletionResult", ("words", "files"))
+
+
+FILE_TYPES = ('file', 'existing_file', 'non_existing_file')
+FOLDER_TYPES = ('folder', 'existing_folder', 'non_existing_folder')
+
+
+def arg_info(action):
+    """Get the completion information for an action"""
+    if isinstance(action, EventAction):
+        return ArgInfo(0, 'n', ())
+    nargs = action.nargs.num
+    typ = action.typ
+    if typ.startswith('list('):
+        typ = typ[5:-1].partition(':')[0].strip()
+    if typ in FILE_TYPES:
+        return ArgInfo(nargs, 'f', ())
+    if typ in FOLDER_TYPES:
+        return ArgInfo(nargs, 'd', ())
+    choices = action.question.choices
+    if choices is None or len(choices) == 0:
+        return ArgInfo(nargs, 'n', ())
+    return ArgInfo(nargs, 'w', tuple(str(choice) for choice in choices))
+
+
+class CompletionNode:
+    """Completion information of a single ArgumentParser"""
+
+    __slots__ = ('options', 'visible', 'positionals', 'children')
+
+    def __init__(self):
+        # option string: ArgInfo
+        self.options = {}
+        # options shown during completion
+        self.visible = []
+        # ArgInfo of the positional arguments
+        self.positionals = []
+        # for each subparser: {case: node index}
+        self.children = []
+
+    def resolve(self, option):
+        """Return the option for an option string or an unique abbreviation"""
+        if option in self.options:
+            return option
+        if not option.startswith('--'):
+            return None
+        found = [opt for opt in self.options if opt.startswith(option)]
+        if len(found) == 1:
+            return found[0]
+        return None
+
+
+class CompletionTable:
+    """Flat representation of a parser tree, used to generate completions"""
+
+    __slots__ = ('nodes',)
+
+    def __init__(self, parser):
+        self.nodes = []
+        self._add_parser(parser)
+
+    def _add_parser(self, parser):
+        idx = len(self.nodes)
+        node = CompletionNode()
+        self.nodes.append(node)
+        #
+        for action in parser.optional_args:
+            info = arg_info(action)
+            for option in action.fullname:
+                node.options[option] = info
+                if not action.is_hidden:
+                    node.visible.append(option)
+        node.positionals = [arg_info(arg) for arg in parser.args]
+        for child in parser.children:
+            node.children.append({case: self._add_parser(subparser)
+                                  for case, subparser in child.cases.items()})
+        return idx
+
+    def complete(self, words):
+        """Return the completion candidates for the last entry in words
+
+        Parameters
+        ----------
+        words: list(str)
+            commandline arguments without the program name, the last entry
+            is the word to be completed and can be empty
+
+        Returns
+        -------
+        CompletionResult
+            matching words, and if files or folders should be completed
+        """
+        walker = _Walker(self)
+        if len(words) == 0:
+            words = ['']
+        for word in words[:-1]:
+            walker.consume(word)
+        return walker.candidates(words[-1])
+
+
+class _Walker:
+    """Follow the parser logic of the `ArgumentParser` through a `CompletionTable`"""
+
+    __slots__ = ('table', 'node', 'npos', 'nchild', 'remaining', 'pending', 'stack')
+
+    def __init__(self, table):
+        self.table = table
+        self.node = 0
+        self.npos = 0
+        self.nchild = 0
+        self.remaining = 0
+        self.pending = None
+        self.stack = []
+
+    @property
+    def current(self):
+        return self.table.nodes[self.node]
+
+    def consume(self, word):
+        """process a finished word"""
+        if self.remaining == '+':
+            if not _is_option(word):
+                return
+            self.remaining = 0
+        elif self.remaining > 0:
+            self.remaining -= 1
+            return
+        self.pending = None
+        if word == '--':
+            return
+        if _is_option(word):
+            option = self.current.resolve(word)
+            if option is not None:
+                self.pending = self.current.options[option]
+                self.remaining = self.pending.nargs
+            return
+        while True:
+            node = self.current
+            if self.npos < len(node.positionals):
+                self.pending = node.positionals[self.npos]
+                self.npos += 1
+                self.remaining = self.pending.nargs
+                if self.remaining != '+':
+                    self.remaining -= 1
+                return
+            if self.nchild < len(node.children):
+                target = node.children[self.nchild].get(word)
+                self.nchild += 1
+                if target is not None:
+                    self.stack.append((self.node, self.npos, self.nchild))
+                    self.node, self.npos, self.nchild = target, 0, 0
+                return
+            if len(self.stack) == 0:
+                return
+            self.node, self.npos, self.nchild = self.stack.pop()
+
+    def candidates(self, cur):
+        """return the candidates for the current word"""
+        if self.pending is not None and self.remaining != 0 and not _is_option(cur):
+            return _values(self.pending, cur)
+        if cur.startswith('-'):
+            return _words(self.current.visible, cur)
+        while True:
+            node = self.current
+            if self.npos < len(node.positionals):
+                return _values(node.positionals[self.npos], cur)
+            if self.nchild < len(node.children):
+                return _words(node.children[self.nchild], cur)
+            if len(self.stack) == 0:
+                return CompletionResult((), None)
+            self.node, self.npos, self.nchild = self.stack.pop()
+
+
+def _is_option(word):
+    return word.startswith('-') and not is_number(word)
+
+
+def _words(words, cur):
+    return CompletionResult(tuple(word for word in words if word.startswith(cur)), None)
+
+
+def _values(info, cur):
+    if info.kind in ('f', 'd'):
+        return CompletionResult((), info.kind)
+    return _words(info.words, cur)
+
+
+def get_completion_table(questions, *, presets=None):
+    """Create the `CompletionTable` for a parser, Colt class, question form or questions
+
+    Parameters
+    ----------
+    questions: ArgumentParser, Colt, QuestionForm, str or QuestionASTGenerator
+        the commandline interface to be completed
+
+    presets: str, optional
+        presets used for the questions
+
+    Returns
+    -------
+    CompletionTable
+    """
+    return CompletionTable(_get_parser(questions, presets))
+
+
+def _get_parser(questions, presets):
+    if isinstance(questions, ArgumentParser):
+        return questions
+    if isinstance(questions, QuestionForm):
+        return CommandlineParserVisitor(HelpFormatter()).visit(questions)
+    if hasattr(questions, '_get_commandline_parser'):
+        return questions._get_commandline_parser(presets=presets)
+    return get_commandline_parser(questions, presets=presets)
+
+
+def _encode_words(words):
+    return "".join(f"{word}\0" for word in words).encode('utf-8') + b"\n"
+
+
+def _decode_words(request):
+    words = request.decode('utf-8', 'replace').rstrip('\n').split('\0')
+    # every word is terminated by \0
+    words.pop()
+    return words
+
+
+def _encode_result(result):
+    return "\n".join((result.files or 'w', *result.words)).encode('utf-8') + b"\n"
+
+
+def _decode_result(reply):
+    mode, *words = reply.decode('utf-8', 'replace').splitlines()
+    if mode == 'w':
+        mode = None
+    return CompletionResult(tuple(words), mode)
+
+
+class _CompletionRequestHandler(socketserver.StreamRequestHandler):
+    """Handle a single completion request
+
+    The request contains the \\0 terminated words followed by a newline,
+    the reply the completion mode (w, f or d) followed by the candidates,
+    one per line. Clients that do not send a request in time are dropped.
+    """
+
+    # seconds, per socket operation
+    timeout = 1.0
+    # maximum size of a request in bytes
+    max_request = 65536
+
+    def handle(self):
+        try:
+            request = self.rfile.readline(self.max_request)
+        except OSError:
+            return
+        words = _decode_words(request)
+        self.wfile.write(_encode_result(self.server.get_table().complete(words)))
+
+
+class CompletionServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Answer completion requests on a unix socket with a resident `CompletionTable`,
+    every request is handled in its own thread
+
+    For Colt classes the table is rebuilt as soon as their fingerprint changes,
+    e.g. when new plugins got registered, for all other questions `refresh`
+    needs to be called manually.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path, questions, *, presets=None):
+        self._questions = questions
+        self._presets = presets
+        self._lock = threading.Lock()
+        self._fingerprint = _get_fingerprint(questions)
+        self.table = get_completion_table(questions, presets=presets)
+        self._bound = False
+        _remove_stale_socket(path)
+        super().__init__(path, _CompletionRequestHandler)
+
+    def get_table(self):
+        """Return the completion table, rebuild it if the questions changed"""
+        fingerprint = _get_fingerprint(self._questions)
+        if fingerprint is None:
+            return self.table
+        with self._lock:
+            if fingerprint != self._fingerprint:
+                self.table = get_completion_table(self._questions, presets=self._presets)
+                self._fingerprint = fingerprint
+            return self.table
+
+    def refresh(self):
+        """Rebuild the completion table, e.g. after new plugins got loaded"""
+        with self._lock:
+            self._fingerprint = _get_fingerprint(self._questions)
+            self.table = get_completion_table(self._questions, presets=self._presets)
+
+    def server_bind(self):
+        super().server_bind()
+        self._bound = True
+
+    def server_close(self):
+        super().server_close()
+        # only remove the socket file created by this server
+        if self._bound is True and os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        self._bound = False
+
+
+def _get_fingerprint(questions):
+    """fingerprint of Colt classes, None for all other questions"""
+    fingerprint = getattr(questions, '_colt_fingerprint', None)
+    if fingerprint is None:
+        return None
+    return fingerprint()
+
+
+def _remove_stale_socket(path):
+    """remove the socket file left by a crashed server, the socket
+    of a running server is kept"""
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def serve_completion(questions, path, *, presets=None):
+    """Serve completions for the questions on the unix socket `path` until interrupted"""
+    with CompletionServer(path, questions, presets=presets) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def request_completion(path, words, *, timeout=1.0):
+    """Request the completion of `words` from a running `CompletionServer`
+
+    Returns
+    -------
+    CompletionResult
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(_encode_words(words))
+        sock.shutdown(socket.SHUT_WR)
+        reply = b"".join(iter(lambda: sock.recv(65536), b""))
+    return _decode_result(reply)
+
+
+def completion_script(questions, prog, *, shell='bash', presets=None, socket=None):
+    """Generate a static completion script
+
+    Parameters
+    ----------
+    questions: ArgumentParser, Colt, QuestionForm, str or QuestionASTGenerator
+        the commandline interface to be completed
+
+    prog: str
+        name of the executable the completion is registered for
+
+    shell: str, optional
+        one of bash, zsh, fish
+
+    presets: str, optional
+        presets used for the questions
+
+    socket: str, optional
+        path of the unix socket of a `CompletionServer`, that is queried
+        before the static tables are used
+
+    Returns
+    -------
+    str
+        the completion script, e.g. to be sourced in the shell's rc file
+    """
+    writer = SCRIPT_WRITERS.get(shell)
+    if writer is None:
+        raise ValueError(f"Shell '{shell}' unknown, use one of [{', '.join(SCRIPT_WRITERS)}]")
+    table = get_completion_table(questions, presets=presets)
+    return writer(table, prog, socket=socket).write()
+
+
+def _quote(string):
+    """quote string for bash and zsh"""
+    return "'" + string.replace("'", "'\\''") + "'"
+
+
+def _fish_quote(string):
+    """quote string for fish"""
+    return "'" + string.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+class _ScriptWriter(ABC):
+    """Basic logic to write the lookup table of a completion script,
+    abbreviated options are resolved by the scripts"""
+
+    def __init__(self, table, prog, *, socket=None):
+        self.table = table
+        self.prog = prog
+        self.socket = socket
+        self.func = '_colt_' + re.sub(r'\W', '_', prog)
+
+    @property
+    def fmt(self):
+        return {'func': self.func, 'prog': self.prog, 'socket': _quote(self.socket or '')}
+
+    def data(self):
+        """Lookup table of the completion table as (key, value) pairs"""
+        for i, node in enumerate(self.table.nodes):
+            yield f"o{i}", " ".join(node.visible)
+            yield f"l{i}", " ".join(node.options)
+            for option, info in node.options.items():
+                yield from self._arg_data(f"{i} {option}", info)
+            yield f"p{i}", str(len(node.positionals))
+            for ipos, info in enumerate(node.positionals):
+                yield from self._arg_data(f"{i} {ipos}", info)
+            yield f"n{i}", str(len(node.children))
+            for ichild, cases in enumerate(node.children):
+                yield f"s{i} {ichild}", " ".join(cases)
+                for case, target in cases.items():
+                    yield f"t{i} {ichild} {case}", str(target)
+
+    @staticmethod
+    def _arg_data(key, info):
+        yield f"a{key}", f"{info.nargs} {info.kind}"
+        if info.kind == 'w':
+            yield f"w{key}", " ".join(info.words)
+
+    @abstractmethod
+    def write(self):
+        """Return the completion script"""
+
+
+class BashScriptWriter(_ScriptWriter):
+    """Completion script for bash, the walker is shared with zsh"""
+
+    header = "# bash completion for {prog}, generated by colt\n"
+
+    walker = r"""
+{func}_request() {{
+    printf '%s\0' "$@"
+    echo
+}}
+
+{func}_daemon() {{
+    local sock={socket} reply
+    [ -n "$sock" ] && [ -S "$sock" ] || return 1
+    command -v socat >/dev/null 2>&1 || return 1
+    reply="$({func}_request "$@" | socat -t1 - "UNIX-CONNECT:$sock" 2>/dev/null)" || return 1
+    [ -n "$reply" ] || return 1
+    for _colt_cur; do :; done
+    _colt_mode="${{reply%%$'\n'*}}" _colt_words=''
+    case "$reply" in
+        *$'\n'*) _colt_words="${{reply#*$'\n'}}" ;;
+    esac
+}}
+
+{func}_option() {{
+    local rest option found=''
+    {func}_data "a$1 $2"
+    if [ -n "$REPLY" ]; then
+        REPLY="$2"
+        return
+    fi
+    REPLY=''
+    [[ "$2" == --* ]] || return
+    # unique abbreviation of a long option
+    {func}_data "l$1"
+    rest="$REPLY "
+    while [ -n "$rest" ]; do
+        option="${{rest%% *}}"
+        rest="${{rest#* }}"
+        if [[ "$option" == "$2"* ]]; then
+            [ -n "$found" ] && found='' && break
+            found="$option"
+        fi
+    done
+    REPLY="$found"
+}}
+
+{func}_values() {{
+    {func}_data "a$1"
+    case "${{REPLY#* }}" in
+        f) _colt_mode=f ;;
+        d) _colt_mode=d ;;
+        w) {func}_data "w$1"; _colt_mode=w; _colt_words="$REPLY" ;;
+        *) _colt_mode='' ;;
+    esac
+}}
+
+{func}_pop() {{
+    top="${{stack%% *}}"
+    stack="${{stack#* }}"
+    node="${{top%%,*}}"
+    top="${{top#*,}}"
+    npos="${{top%%,*}}"
+    nchild="${{top#*,}}"
+}}
+
+{func}_walk() {{
+    local node=0 npos=0 nchild=0 remaining=0 pending='' stack='' word top
+    _colt_mode='' _colt_words=''
+    while [ $# -gt 1 ]; do
+        word="$1"
+        shift
+        if [ "$remaining" = '+' ]; then
+            if [[ "$word" == -* && "$word" != -[0-9]* ]]; then
+                remaining=0
+            else
+                continue
+            fi
+        elif [ "$remaining" -gt 0 ]; then
+            remaining=$((remaining - 1))
+            continue
+        fi
+        pending=''
+        [ "$word" = '--' ] && continue
+        if [[ "$word" == -* && "$word" != -[0-9]* ]]; then
+            {func}_option "$node" "$word"
+            if [ -n "$REPLY" ]; then
+                pending="$node $REPLY"
+                {func}_data "a$pending"
+                remaining="${{REPLY%% *}}"
+            fi
+            continue
+        fi
+        while :; do
+            {func}_data "p$node"
+            if [ "$npos" -lt "${{REPLY:-0}}" ]; then
+                pending="$node $npos"
+                npos=$((npos + 1))
+                {func}_data "a$pending"
+                remaining="${{REPLY%% *}}"
+                [ "$remaining" != '+' ] && remaining=$((remaining - 1))
+                break
+            fi
+            {func}_data "n$node"
+            if [ "$nchild" -lt "${{REPLY:-0}}" ]; then
+                {func}_data "t$node $nchild $word"
+                nchild=$((nchild + 1))
+                if [ -n "$REPLY" ]; then
+                    stack="$node,$npos,$nchild $stack"
+                    node="$REPLY" npos=0 nchild=0
+                fi
+                break
+            fi
+            [ -z "$stack" ] && break
+            {func}_pop
+        done
+    done
+    _colt_cur="$1"
+    if [ -n "$pending" ] && [ "$remaining" != 0 ] && \
+            [[ "$_colt_cur" != -* || "$_colt_cur" == -[0-9]* ]]; then
+        {func}_values "$pending"
+        return
+    fi
+    if [[ "$_colt_cur" == -* ]]; then
+        {func}_data "o$node"
+        _colt_mode=w _colt_words="$REPLY"
+        return
+    fi
+    while :; do
+        {func}_data "p$node"
+        if [ "$npos" -lt "${{REPLY:-0}}" ]; then
+            {func}_values "$node $npos"
+            return
+        fi
+        {func}_data "n$node"
+        if [ "$nchild" -lt "${{REPLY:-0}}" ]; then
+            {func}_data "s$node $nchild"
+            _colt_mode=w _colt_words="$REPLY"
+            return
+        fi
+        [ -z "$stack" ] && return
+        {func}_pop
+    done
+}}
+"""
+
+    main = r"""
+{func}() {{
+    local line="${{COMP_LINE:0:COMP_POINT}}"
+    local -a words
+    read -ra words <<< "$line"
+    [[ "$line" == *[[:space:]] ]] && words+=('')
+    {func}_daemon "${{words[@]:1}}" || {func}_walk "${{words[@]:1}}"
+    local IFS=$' \t\n'
+    case "$_colt_mode" in
+        f) compopt -o filenames 2>/dev/null
+           COMPREPLY=($(compgen -f -- "$_colt_cur")) ;;
+        d) compopt -o filenames 2>/dev/null
+           COMPREPLY=($(compgen -d -- "$_colt_cur")) ;;
+        w) COMPREPLY=($(compgen -W "$_colt_words" -- "$_colt_cur")) ;;
+        *) COMPREPLY=() ;;
+    esac
+    # bash splits words at colons, only complete the last part
+    if [[ "$_colt_cur" == *:* && "$COMP_WORDBREAKS" == *:* ]]; then
+        local prefix="${{_colt_cur%"${{_colt_cur##*:}}"}}" i
+        for i in "${{!COMPREPLY[@]}}"; do
+            COMPREPLY[$i]="${{COMPREPLY[$i]#"$prefix"}}"
+        done
+    fi
+}}
+
+complete -F {func} {prog}
+"""
+
+    def write_data(self):
+        lines = [f"{self.func}_data() {{", '    case "$1" in']
+        for key, value in self.data():
+            lines.append(f"        {_quote(key)}) REPLY={_quote(value)} ;;")
+        lines += ["        *) REPLY='' ;;", "    esac", "}"]
+        return "\n".join(lines) + "\n"
+
+    def write(self):
+        fmt = self.fmt
+        return (self.header.format(**fmt) + self.write_data()
+                + self.walker.format(**fmt) + self.main.format(**fmt))
+
+
+class ZshScriptWriter(BashScriptWriter):
+    """Completion script for zsh, uses the same walker as bash"""
+
+    header = "#compdef {prog}\n# zsh completion for {prog}, generated by colt\n"
+
+    main = r"""
+{func}() {{
+    {func}_daemon "${{(@)words[2,CURRENT]}}" || {func}_walk "${{(@)words[2,CURRENT]}}"
+    case "$_colt_mode" in
+        f) _files ;;
+        d) _files -/ ;;
+        w) compadd -- ${{=_colt_words}} ;;
+    esac
+}}
+
+compdef {func} {prog}
+"""
+
+
+class FishScriptWriter(_ScriptWriter):
+    """Completion script for fish"""
+
+    script = r"""
+function {func}_request
+    string join0 -- $argv
+    echo
+end
+
+function {func}_daemon
+    set -l sock {socket}
+    test -n "$sock"; and test -S "$sock"; or return 1
+    command -q socat; or return 1
+    set -l reply ({func}_request $argv | socat -t1 - "UNIX-CONNECT:$sock" 2>/dev/null)
+    or return 1
+    test (count $reply) -gt 0; or return 1
+    switch $reply[1]
+        case f
+            __fish_complete_path $argv[-1]
+        case d
+            __fish_complete_directories $argv[-1]
+        case '*'
+            set -e reply[1]
+            test (count $reply) -gt 0; and printf '%s\n' $reply
+    end
+    return 0
+end
+
+function {func}_option
+    set -l info ({func}_data "a$argv[1] $argv[2]")
+    if test -n "$info"
+        echo $argv[2]
+        return
+    end
+    string match -q -- '--*' $argv[2]; or return
+    # unique abbreviation of a long option
+    set -l found
+    for option in (string split ' ' -- ({func}_data "l$argv[1]"))
+        if string match -q -- "$argv[2]*" $option
+            set -a found $option
+        end
+    end
+    if test (count $found) -eq 1
+        echo $found[1]
+    end
+end
+
+function {func}_values
+    set -l info ({func}_data "a$argv[1]")
+    switch (string split -m1 ' ' -- $info)[2]
+        case f
+            __fish_complete_path $argv[2]
+        case d
+            __fish_complete_directories $argv[2]
+        case w
+            string split ' ' -- ({func}_data "w$argv[1]")
+    end
+end
+
+function {func}_walk
+    set -l node 0
+    set -l npos 0
+    set -l nchild 0
+    set -l remaining 0
+    set -l pending ''
+    set -l stack
+    set -l n (count $argv)
+    set -l i 0
+    while test $i -lt (math $n - 1)
+        set i (math $i + 1)
+        set -l word $argv[$i]
+        set -l is_option 0
+        if string match -qr -- '^-' $word; and not string match -qr -- '^-[0-9]' $word
+            set is_option 1
+        end
+        if test "$remaining" = '+'
+            if test $is_option = 1
+                set remaining 0
+            else
+                continue
+            end
+        else if test $remaining -gt 0
+            set remaining (math $remaining - 1)
+            continue
+        end
+        set pending ''
+        if test "$word" = '--'
+            continue
+        end
+        if test $is_option = 1
+            set -l option ({func}_option $node $word)
+            if test -n "$option"
+                set pending "$node $option"
+                set remaining (string split -m1 ' ' -- ({func}_data "a$pending"))[1]
+            end
+            continue
+        end
+        while true
+            if test $npos -lt ({func}_data "p$node")
+                set pending "$node $npos"
+                set npos (math $npos + 1)
+                set remaining (string split -m1 ' ' -- ({func}_data "a$pending"))[1]
+                if test "$remaining" != '+'
+                    set remaining (math $remaining - 1)
+                end
+                break
+            end
+            if test $nchild -lt ({func}_data "n$node")
+                set -l target ({func}_data "t$node $nchild $word")
+                set nchild (math $nchild + 1)
+                if test -n "$target"
+                    set -p stack "$node,$npos,$nchild"
+                    set node $target
+                    set npos 0
+                    set nchild 0
+                end
+                break
+            end
+            if test (count $stack) -eq 0
+                break
+            end
+            set -l top (string split ',' -- $stack[1])
+            set -e stack[1]
+            set node $top[1]
+            set npos $top[2]
+            set nchild $top[3]
+        end
+    end
+    set -l cur $argv[-1]
+    set -l cur_is_option 0
+    if string match -qr -- '^-' $cur; and not string match -qr -- '^-[0-9]' $cur
+        set cur_is_option 1
+    end
+    if test -n "$pending"; and test "$remaining" != 0; and test $cur_is_option = 0
+        {func}_values $pending $cur
+        return
+    end
+    if string match -qr -- '^-' $cur
+        string split ' ' -- ({func}_data "o$node")
+        return
+    end
+    while true
+        if test $npos -lt ({func}_data "p$node")
+            {func}_values "$node $npos" $cur
+            return
+        end
+        if test $nchild -lt ({func}_data "n$node")
+            string split ' ' -- ({func}_data "s$node $nchild")
+            return
+        end
+        if test (count $stack) -eq 0
+            return
+        end
+        set -l top (string split ',' -- $stack[1])
+        set -e stack[1]
+        set node $top[1]
+        set npos $top[2]
+        set nchild $top[3]
+    end
+end
+
+function {func}
+    set -l tokens (commandline -opc)
+    set -e tokens[1]
+    {func}_daemon $tokens (commandline -ct)
+    or {func}_walk $tokens (commandline -ct)
+end
+
+complete -c {prog} -f -a '({func})'
+"""
+
+    def write_data(self):
+        lines = [f"function {self.func}_data", "    switch $argv[1]"]
+        for key, value in self.data():
+            lines.append(f"        case {_fish_quote(key)}")
+            lines.append(f"            echo {_fish_quote(value)}")
+        lines += ["        case '*'", "            echo ''", "    end", "end"]
+        return "\n".join(lines) + "\n"
+
+    @property
+    def fmt(self):
+        fmt = super().fmt
+        fmt.update({'socket': _fish_quote(self.socket or '')})
+        return fmt
+
+    def write(self):
+        return (f"# fish completion for {self.prog}, generated by colt\n" + self.write_data()
+                + self.script.format(**self.fmt))
+
+
+SCRIPT_WRITERS = {
+    'bash': BashScriptWriter,
+    'zsh': ZshScriptWriter,
+    'fish': FishScriptWriter,
+}
@@ -1,15 +1,31 @@
 """Implements ways to lazy load modules"""
-import inspect
+import sys
+import threading
 from importlib import import_module
 from types import ModuleType
 
 
+def _get_callers_globals(depth=1):
+    """Return the globals of the caller of the calling function
+
+    Only the needed frames are accessed, instead of building the info of the
+    whole stack, as `inspect.stack` does.
+
+    Parameters
+    ----------
+    depth: int, optional
+        number of frames above the calling function
+    """
+    # + 1 to skip this function
+    return sys._getframe(depth + 1).f_globals
+
+
 class LazyImporter:
 
     def __init__(self, data, *, callers_globals=None):
         if callers_globals is None:
-            # in case caller globals is not defined get it from the spec
-            callers_globals = inspect.stack()[1][0].f_globals
+            # in case caller globals is not defined get it from the caller's frame
+            callers_globals = _get_callers_globals()
         self._callers_gloabals = callers_globals
         # get the package name
         self._package = callers_globals['__package__']
@@ -17,19 +33,48 @@ class LazyImporter:
         if not isinstance(data, dict):
             raise ValueError("modules need to be a dict")
         self._data = data
+        self._prefetch = None
+
+    def prefetch(self):
+        """Start importing the modules in a background thread,
+        `load` waits for it and places the modules in the caller's globals
+
+        Returns
+        -------
+        threading.Thread
+            the thread importing the modules
+        """
+        if self._prefetch is None:
+            self._prefetch = threading.Thread(target=self._prefetch_modules, daemon=True,
+                                              name="colt-prefetch")
+            self._prefetch.start()
+        return self._prefetch
+
+    def _prefetch_modules(self):
+        for local_name, name in self._data.items():
+            try:
+                self._import_module(name, local_name)
+            except Exception:
+                # errors are raised again by `load`
+                pass
 
     def load(self):
+        if self._prefetch is not None:
+            self._prefetch.join()
         for local_name, name in self._data.items():
-            if name is None:
-                name = local_name
             self._load_module(name, local_name)
 
-    def _load_module(self, name, local_name):
+    def _import_module(self, name, local_name):
+        if name is None:
+            name = local_name
         package = None
         if name.startswith('.'):
             package = self._package
         # Import the target
-        module = import_module(name, package=package)
+        return import_module(name, package=package)
+
+    def _load_module(self, name, local_name):
+        module = self._import_module(name, local_name)
         # place it into the parents global scope
         self._callers_gloabals[local_name] = module
 
@@ -52,14 +97,14 @@ class LazyImport(ModuleType):
             name of the module in the caller's global scope
 
         callers_globals, dict:
-            the globals of the caller, if None it gets evaluated directly
-            using `inspect`
+            the globals of the caller, if None they are taken from the
+            caller's frame
         """
         super().__init__(name)
         #
         if callers_globals is None:
-            # in case caller globals is not defined get it from the spec
-            callers_globals = inspect.stack()[1][0].f_globals
+            # in case caller globals is not defined get it from the caller's frame
+            callers_globals = _get_callers_globals()
         if local_name is None:
             if name.startswith('.'):
                 raise ValueError(f"For relative import '{name}' define local_name")
@@ -107,12 +152,12 @@ class LazyImportCreator:
         ----------
 
         callers_globals, dict:
-            the globals of the caller, if None it gets evaluated directly
-            using `inspect`
+            the globals of the caller, if None they are taken from the
+            caller's frame
         """
         if callers_globals is None:
             # get globals of the caller
-            callers_globals = inspect.stack()[1][0].f_globals
+            callers_globals = _get_callers_globals()
         self._callers_gloabals = callers_globals
 
     def __enter__(self):
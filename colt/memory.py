@@ -0,0 +1,295 @@
+"""Memory accounting for question trees, forms and answers
+
+`memory_report` walks a `QuestionASTGenerator`, `QuestionForm` or `AnswersBlock`
+and reports the bytes per node type and per block, builtin objects (strings,
+dicts, lists, ...) are accounted to the colt object that holds them.
+`share_duplicates` interns duplicated strings and shares equal `Choices`.
+"""
+import sys
+from collections import namedtuple
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+#
+from .validator import Choices
+
+
+__all__ = ["MemoryReport", "memory_report", "share_duplicates"]
+
+
+Duplicates = namedtuple("Duplicates", ("count", "bytes"))
+SharingStats = namedtuple("SharingStats", ("strings", "choices"))
+
+
+# block like objects, their content is reported per block
+_BLOCK_TYPES = ('QuestionBlock', 'SubquestionBlock', 'QuestionContainer',
+                'ConditionalQuestion', 'AnswersBlock', 'SubquestionsAnswer')
+_SKIP_TYPES = (type, ModuleType, FunctionType, MethodType, BuiltinFunctionType)
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+def _is_colt_object(obj):
+    return type(obj).__module__.startswith('colt')
+
+
+def _attributes(obj):
+    """yield (name, value) of all attributes set in __dict__ or __slots__"""
+    dct = getattr(obj, '__dict__', None)
+    if dct is not None:
+        yield from dct.items()
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for slot in slots:
+            if slot in ('__dict__', '__weakref__'):
+                continue
+            try:
+                yield slot, getattr(obj, slot)
+            except AttributeError:
+                pass
+
+
+def _children(obj):
+    """yield (key, child) of an object that is followed during the walk,
+    key is only given for entries of mappings, to name the blocks"""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            yield None, key
+            yield key, value
+    elif isinstance(obj, _CONTAINERS):
+        for value in obj:
+            yield None, value
+    elif _is_colt_object(obj):
+        for _, value in _attributes(obj):
+            yield None, value
+        dct = getattr(obj, '__dict__', None)
+        if dct is not None:
+            yield None, dct
+        if type(obj).__name__ == 'AnswersBlock':
+            yield from obj.items()
+
+
+def _choices_key(choices):
+    """hashable key of the choices, types are included to distinguish 1 and 1.0"""
+    try:
+        key = tuple((type(choice), choice) for choice in choices.choices)
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+class MemoryReport:
+    """Memory footprint of a colt object
+
+    Attributes
+    ----------
+    total: int
+        bytes of all reachable objects, shared objects are counted once
+
+    types: dict
+        {type name: [count, bytes]}, builtin objects are accounted to their owner
+
+    blocks: dict
+        {block name: bytes}
+
+    duplicate_strings: Duplicates
+        number of strings that are equal to an other string and their bytes
+
+    duplicate_choices: Duplicates
+        number of `Choices` equal to other `Choices` and their bytes
+    """
+
+    __slots__ = ('total', 'types', 'blocks', 'duplicate_strings', 'duplicate_choices')
+
+    def __init__(self, total, types, blocks, duplicate_strings, duplicate_choices):
+        self.total = total
+        self.types = types
+        self.blocks = blocks
+        self.duplicate_strings = duplicate_strings
+        self.duplicate_choices = duplicate_choices
+
+    def __str__(self):
+        lines = [f"Total: {self.total} bytes", "",
+                 f"{'type':<30} {'count':>8} {'bytes':>12}"]
+        for name, (count, nbytes) in sorted(self.types.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<30} {count:>8} {nbytes:>12}")
+        lines += ["", f"{'block':<39} {'bytes':>12}"]
+        for name, nbytes in sorted(self.blocks.items(), key=lambda item: -item[1]):
+            lines.append(f"{name or '(main)':<39} {nbytes:>12}")
+        lines += ["",
+                  f"duplicated strings: {self.duplicate_strings.count} "
+                  f"({self.duplicate_strings.bytes} bytes)",
+                  f"duplicated choices: {self.duplicate_choices.count} "
+                  f"({self.duplicate_choices.bytes} bytes)"]
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return f"MemoryReport(total={self.total})"
+
+
+class _MemoryWalker:
+    """Walk all objects reachable from a colt object"""
+
+    def __init__(self):
+        self.seen = set()
+        self.total = 0
+        self.types = {}
+        self.blocks = {}
+        self.strings = {}
+        self.choices = {}
+
+    def walk(self, root):
+        # (object, owner type name, block name, key in the parent)
+        stack = [(root, None, '', None)]
+        while stack:
+            obj, owner, block, key = stack.pop()
+            if isinstance(obj, _SKIP_TYPES) or id(obj) in self.seen:
+                continue
+            self.seen.add(id(obj))
+            #
+            size = sys.getsizeof(obj)
+            self.total += size
+            if _is_colt_object(obj):
+                owner = type(obj).__name__
+                stats = self.types.setdefault(owner, [0, 0])
+                stats[0] += 1
+                if owner in _BLOCK_TYPES:
+                    block = self._block_name(obj, block, key)
+            elif owner is None:
+                owner = type(obj).__name__
+                self.types.setdefault(owner, [0, 0])[0] += 1
+            self.types[owner][1] += size
+            self.blocks[block] = self.blocks.get(block, 0) + size
+            #
+            if type(obj) is str:
+                self.strings.setdefault(obj, []).append(size)
+            elif isinstance(obj, Choices):
+                self._add_choices(obj)
+            #
+            for child_key, child in _children(obj):
+                stack.append((child, owner, block, child_key))
+        return self
+
+    @staticmethod
+    def _block_name(obj, block, key):
+        name = getattr(obj, 'name', None)
+        if type(obj).__name__ in ('QuestionBlock', 'SubquestionBlock') and isinstance(name, str):
+            return name
+        if not isinstance(key, str):
+            return block
+        if block == '':
+            return key
+        return f"{block}::{key}"
+
+    def _add_choices(self, choices):
+        key = _choices_key(choices)
+        if key is None:
+            return
+        size = sys.getsizeof(choices) + sys.getsizeof(choices.choices)
+        self.choices.setdefault(key, []).append(size)
+
+    def report(self):
+        return MemoryReport(self.total, self.types, self.blocks,
+                            _duplicates(self.strings), _duplicates(self.choices))
+
+
+def _duplicates(entries):
+    count = 0
+    nbytes = 0
+    for sizes in entries.values():
+        if len(sizes) > 1:
+            count += len(sizes) - 1
+            nbytes += sum(sizes[1:])
+    return Duplicates(count, nbytes)
+
+
+def memory_report(obj):
+    """Report the memory footprint of a colt object
+
+    Parameters
+    ----------
+    obj: QuestionASTGenerator, QuestionForm or AnswersBlock
+        the object to be inspected, any object reachable from it is included
+
+    Returns
+    -------
+    MemoryReport
+        bytes per type and per block, as well as duplicated strings and choices
+    """
+    return _MemoryWalker().walk(obj).report()
+
+
+class _DuplicateSharer:
+    """Replace duplicated strings and Choices by a single shared instance"""
+
+    def __init__(self):
+        self.seen = set()
+        self.choices = {}
+        self.nstrings = 0
+        self.nchoices = 0
+
+    def share(self, value):
+        """return the shared instance of value"""
+        if type(value) is str:
+            shared = sys.intern(value)
+            if shared is not value:
+                self.nstrings += 1
+            return shared
+        if isinstance(value, Choices):
+            key = _choices_key(value)
+            if key is None:
+                return value
+            shared = self.choices.setdefault(key, value)
+            if shared is not value:
+                self.nchoices += 1
+            return shared
+        return value
+
+    def walk(self, root):
+        stack = [root]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, _SKIP_TYPES) or id(obj) in self.seen:
+                continue
+            self.seen.add(id(obj))
+            #
+            if isinstance(obj, dict):
+                self._share_dict(obj)
+                stack.extend(obj.values())
+            elif isinstance(obj, list):
+                obj[:] = [self.share(value) for value in obj]
+                stack.extend(obj)
+            elif isinstance(obj, (tuple, set, frozenset)):
+                stack.extend(obj)
+            elif _is_colt_object(obj):
+                for name, value in list(_attributes(obj)):
+                    shared = self.share(value)
+                    if shared is not value:
+                        try:
+                            setattr(obj, name, shared)
+                        except AttributeError:
+                            shared = value
+                    stack.append(shared)
+        return SharingStats(self.nstrings, self.nchoices)
+
+    def _share_dict(self, dct):
+        items = [(self.share(key), self.share(value)) for key, value in dct.items()]
+        if any(key is not old_key for (key, _), old_key in zip(items, dct)):
+            dct.clear()
+        dct.update(items)
+
+
+def share_duplicates(obj):
+    """Intern duplicated strings and share equal `Choices` objects in place
+
+    Parameters
+    ----------
+    obj: QuestionASTGenerator, QuestionForm or AnswersBlock
+        the object to be compacted
+
+    Returns
+    -------
+    SharingStats
+        number of replaced strings and choices
+    """
+    return _DuplicateSharer().walk(obj)
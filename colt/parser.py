@@ -1,9 +1,18 @@
 import sys
+from bisect import bisect_left
 from collections import namedtuple, UserList
 from contextlib import contextmanager
+from itertools import islice
 
 from .validator import ValidatorErrorNotInChoices
 from .qform import QuestionForm, QuestionVisitor, join_keys, split_keys
+from .qform import format_answer_errors
+from .profiler import profile
+from .lazyimport import LazyImport
+
+
+# only needed by `MainArgumentParser.parse_many`
+multiprocessing = LazyImport('multiprocessing')
 
 
 EmptyQuestion = namedtuple("EmptyQuestion", ("typ", "choices", "comment", "is_hidden"))
@@ -12,12 +21,19 @@ Description = namedtuple("Description", ("logo", "description", "short_descripti
 Spacing = namedtuple("Spacing", ("seperator", "block_seperator"))
 Orders = namedtuple("Ordering", ("main", "error", "short", "args"))
 Blocks = namedtuple("Blocks", ("opt_args", "pos_args", "subparser"))
+ParseResult = namedtuple("ParseResult", ("answers", "error"))
 
 
 class OptionalArgumentsStorage(UserList):
 
-    def __init__(self, lst=None):
-        self._keys = set()
+    def __init__(self, lst=None, *, allow_abbrev=True, single_dash_long=False):
+        # option string -> action
+        self._index = {}
+        # sorted option strings, used to resolve abbreviations
+        self._sorted = None
+        self.allow_abbrev = allow_abbrev
+        # accept long options with a single dash, as the argparse engine
+        self.single_dash_long = single_dash_long
         super().__init__()
         if lst is not None:
             for ele in lst:
@@ -28,6 +44,51 @@ class OptionalArgumentsStorage(UserList):
             raise ValueError("Con only add action objects")
         self._check_options(value)
         self.data.append(value)
+        self._register_options(value)
+
+    def get(self, option):
+        """Return the action for a given option string, long options can also
+        be abbreviated, as long as the abbreviation is unique, and, if
+        `single_dash_long` is True, be given with a single dash
+
+        Returns
+        -------
+        Action or None
+            None if the option is unknown
+
+        Raises
+        ------
+        ValueError
+            if the abbreviation is ambiguous
+        """
+        action = self._index.get(option)
+        if (action is None and self.single_dash_long is True
+                and len(option) > 2 and option[1] != '-'):
+            action = self._index.get('-' + option)
+        if action is not None or self.allow_abbrev is False:
+            return action
+        return self._get_abbreviation(option)
+
+    def _get_abbreviation(self, option):
+        """find an unique action that starts with option"""
+        if not option.startswith('--'):
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._index)
+        #
+        candidates = {}
+        for opt in islice(self._sorted, bisect_left(self._sorted, option), None):
+            if not opt.startswith(option):
+                break
+            action = self._index[opt]
+            candidates[id(action)] = action
+        #
+        if len(candidates) == 0:
+            return None
+        if len(candidates) > 1:
+            names = ', '.join(action.name for action in candidates.values())
+            raise ValueError(f"Ambiguous option {option}, could match {names}")
+        return next(iter(candidates.values()))
 
     def check_answers(self):
         wrong_ones = {}
@@ -44,11 +105,14 @@ class OptionalArgumentsStorage(UserList):
 
     def _check_options(self, action):
         for opt in action.fullname:
-            if opt not in self._keys:
-                self._keys.add(opt)
-            else:
+            if opt in self._index:
                 raise ValueError(f"option {opt} already used defined, no name clashes allowed")
 
+    def _register_options(self, action):
+        for opt in action.fullname:
+            self._index[opt] = action
+        self._sorted = None
+
 
 class FullName:
 
@@ -584,28 +648,33 @@ class HelpFormatter:
               'description', 'short_description', 'comment', 'error')
 
     def __init__(self, settings=None):
-        (self._description, self._orders,
-         self._spacing, self._arg_formatter, self._subparser_formatter, self._blocks,
-         self._info) = self._parse_settings(settings)
+        # settings are only parsed, once help is rendered
+        self._settings = settings
+        self._is_parsed = False
+        # increased on every update, used to invalidate rendered help
+        self.version = 0
         # helper for error storage
         self._error = None
 
     def update(self, settings):
         """update settings with new ones"""
-        (self._description, self._orders,
-         self._spacing, self._arg_formatter, self._subparser_formatter, self._blocks,
-         self._info) = self._parse_settings(settings)
+        self._settings = settings
+        self._is_parsed = False
+        self.version += 1
 
     def info(self, parser):
         """Main information"""
+        self._ensure_settings()
         return self._render(self._orders.main, parser)
 
     def short_info(self, parser):
         """short information"""
+        self._ensure_settings()
         return self._render(self._orders.short, parser)
 
     def error_info(self, parser, error):
         """error information"""
+        self._ensure_settings()
         self._error = str(error)
         return self._render(self._orders.error, parser)
 
@@ -658,7 +727,7 @@ class HelpFormatter:
 
         return "\n\n".join(
                 block.render("".join(self._subparser_formatter.format(arg)
-                             for arg in child.cases.values()),
+                             for arg in child.iter_cases()),
                              title=block.title % child.name)
                 for child in parser.children)
 
@@ -681,10 +750,20 @@ class HelpFormatter:
 
     def format_arg(self, arg):
         """How to format a single line in pos_args, opt_args"""
+        self._ensure_settings()
         return self._arg_formatter.format(arg)
 
     # helper
 
+    def _ensure_settings(self):
+        """parse the settings, if not done yet"""
+        if self._is_parsed is True:
+            return
+        (self._description, self._orders,
+         self._spacing, self._arg_formatter, self._subparser_formatter, self._blocks,
+         self._info) = self._parse_settings(self._settings)
+        self._is_parsed = True
+
     @staticmethod
     def _set_indent(value):
         if isinstance(value, int):
@@ -814,25 +893,55 @@ class HelpFormatter:
         return order
 
 
+class LazyCase:
+    """Case of a `SubParser`, its parser is only created once it is needed"""
+
+    __slots__ = ('name', 'comment', '_build')
+
+    def __init__(self, name, comment, build):
+        self.name = name
+        self.comment = comment
+        self._build = build
+
+    def materialize(self):
+        """create and return the parser of the case"""
+        return self._build()
+
+
 class SubParser(Action):
 
     def __init__(self, name, question, parent):
         _, name = split_keys(name)
         super().__init__(name, question)
+        # {case: ArgumentParser or LazyCase}
         self._options = {}
         self._parent = parent
 
     @property
     def cases(self):
+        """parsers of all cases, cases that were not used yet are created"""
+        for name in self._options:
+            self.get_case(name)
         return self._options
 
+    def iter_cases(self):
+        """iterate over the cases without creating them, each has a `name` and `comment`"""
+        return iter(self._options.values())
+
+    def get_case(self, name):
+        """return the parser of the case `name`, or None if it does not exist"""
+        parser = self._options.get(name, None)
+        if isinstance(parser, LazyCase):
+            parser = parser.materialize()
+        return parser
+
     def to_commandline_str(self):
         return f"{self.fullname} ..."
 
     def consume(self, args):
         value = args.get_arg()  # ignores --, -value
         if value is None:
-            raise ValueError("Two few arguments")
+            raise TooFewArgumentsError(self._parent, "Too few arguments")
         #
         error = ValueError(f"'{self.name}' needs to be "
                            f"[{', '.join(child for child in self._options)}] not '{value}'")
@@ -842,58 +951,215 @@ class SubParser(Action):
         except ValidatorErrorNotInChoices:
             raise error from None
         # not necessary anymore
-        parser = self._options.get(value, None)
+        parser = self.get_case(value)
         if parser is None:
             raise error
+        self._parent.case_selected(self, value)
         return parser
 
     def add_parser(self, name, formatter, *, comment=None):
         parser = ArgumentParser(formatter=formatter, name=name,
-                                comment=comment, parent=self._parent)
+                                comment=comment, parent=self._parent,
+                                allow_abbrev=self._parent.optional_args.allow_abbrev,
+                                single_dash_long=self._parent.optional_args.single_dash_long)
         self._options[name] = parser
+        self._parent.clear_help()
         return parser
 
+    def add_lazy_parser(self, name, build, *, comment=None):
+        """add a case, whose parser is created by `build()` once it is selected,
+        `build` has to add the parser using `add_parser`"""
+        self._options[name] = LazyCase(name, comment, build)
+        self._parent.clear_help()
+
+
+class ArgumentParserError(Exception):
+    """Base class of all errors while parsing commandline arguments
+
+    The message shown to the user is only rendered when it is requested.
+
+    Parameters
+    ----------
+    parser: ArgumentParser
+        the parser in which the error occurred
+
+    error: Exception or str, optional
+        the underlying error
+    """
+
+    # 'error' for parsing errors, 'help' and 'usage' if the (short) help should be shown
+    kind = 'error'
+    # exit status used by `exit`, the same as argparse
+    exit_code = 2
+
+    def __init__(self, parser, error=None):
+        super().__init__(error)
+        self.parser = parser
+        self.error = error
+        self._message = None
+
+    @classmethod
+    def from_message(cls, message):
+        """Create an error that only stores its rendered message"""
+        error = cls(None)
+        error._message = message
+        return error
+
+    @property
+    def message(self):
+        """the rendered message"""
+        if self._message is None:
+            self._message = self._render()
+        return self._message
+
+    def _render(self):
+        return self.parser.formatter.error_info(self.parser, self.error)
+
+    def __str__(self):
+        return self.message
+
+    def __reduce__(self):
+        # parsers cannot be pickled, only keep the message
+        return (self.from_message, (self.message,))
+
+    def exit(self):
+        """print the message and exit with `exit_code`"""
+        print(self.message)
+        raise SystemExit(self.exit_code)
+
+
+class HelpRequested(ArgumentParserError):
+    """The help message was requested"""
+
+    kind = 'help'
+    exit_code = 0
+
+    def _render(self):
+        return self.parser.help
+
+
+class UsageRequested(ArgumentParserError):
+    """The arguments could not be parsed, but a help option was given"""
+
+    kind = 'usage'
+    exit_code = 0
+
+    def _render(self):
+        return self.parser.short_help
+
+
+class ArgumentError(ArgumentParserError):
+    """The commandline arguments could not be parsed"""
+
+
+class UnknownOptionError(ArgumentError):
+    """An option is not known to the parser"""
+
+
+class InvalidValueError(ArgumentError):
+    """A value could not be set"""
+
+
+class TooFewArgumentsError(ArgumentError):
+    """Not all positional arguments were given"""
+
+
+class TooManyArgumentsError(ArgumentError):
+    """Arguments are left after parsing"""
+
+
+class AnswersNotDefinedError(ArgumentParserError):
+    """Not all answers are defined after parsing,
+    `error` is a dict of {block: {question: error}}"""
+
+    def _render(self):
+        return self.parser.formatter.error_info(self.parser, format_answer_errors(self.error))
+
 
 def get_help(parser):
-    """Closure to get exit to the print_help function of the parser"""
+    """Closure to exit with the help message of the parser"""
 
     def _help():
-        parser.print_help()
-        sys.exit()
+        raise HelpRequested(parser)
 
     return EventAction(["-h", "--help"], _help, comment="show this help message and exit")
 
 
 class ArgumentParser:
 
-    def __init__(self, *, name=None, formatter=None, parent=None, comment=None):
-        self.optional_args = OptionalArgumentsStorage([get_help(self)])
+    def __init__(self, *, name=None, formatter=None, parent=None, comment=None,
+                 allow_abbrev=True, single_dash_long=False):
+        self.optional_args = OptionalArgumentsStorage([get_help(self)],
+                                                      allow_abbrev=allow_abbrev,
+                                                      single_dash_long=single_dash_long)
         self.args = []
         self.parent = parent
         self.children = []
         self.formatter = formatter
         self.name = name
         self.comment = comment
+        # rendered help messages
+        self._help = {}
 
     @property
     def help(self):
-        return self.formatter.info(self)
+        return self._render_help('info')
+
+    @property
+    def short_help(self):
+        return self._render_help('short_info')
+
+    def clear_help(self):
+        """remove the cached help messages"""
+        self._help.clear()
+
+    def case_selected(self, subparser, case):
+        """called when `case` of the `subparser` got selected"""
+        if self.parent is not None:
+            self.parent.case_selected(subparser, case)
 
     def add_subparser(self, name, question):
         child = SubParser(name, question, parent=self)
         self.children.append(child)
+        self.clear_help()
         return child
 
-    def parse(self, *, args=None, is_last=True):
+    def parse(self, *, args=None, is_last=True, exit_on_error=True):
+        """Parse the commandline arguments
+
+        Parameters
+        ----------
+        args: SysIterator, optional
+            the arguments to parse, by default sys.argv[1:]
+
+        is_last: bool, optional
+            if True, no arguments are allowed to be left
+
+        exit_on_error: bool, optional
+            if True, print the error or help message and exit,
+            else raise an ArgumentParserError
+
+        Raises
+        ------
+        ArgumentParserError
+            if `exit_on_error` is False and the arguments could not be parsed
+        """
         if args is None:
             args = SysIterator()
         try:
-            self._parse(args, is_last)
+            self._parse(args, is_last, exit_on_error)
+            return
+        except ArgumentParserError as e:
+            error = e
         except ValueError as e:
-            if self._recover_help(args):
-                self.exit_help()
-            else:
-                self.error_help(e)
+            error = InvalidValueError(self, e)
+        # errors of this parser show the usage, if help was requested
+        if (isinstance(error, ArgumentError) and error.parser is self
+                and self._recover_help(args)):
+            error = UsageRequested(self)
+        if exit_on_error:
+            error.exit()
+        raise error from None
 
     def add_argument(self, name, question, *, metavar=None):
         if isinstance(name, list) or name.startswith('-'):
@@ -902,28 +1168,36 @@ class ArgumentParser:
         else:
             arg = PositionalArgument(name, question, metavar=metavar)
             self.args.append(arg)
+        self.clear_help()
 
     def add_action(self, action):
         self.optional_args.append(action)
+        self.clear_help()
 
     def exit_help(self):
-        print(self.formatter.short_info(self))
-        raise SystemExit
+        UsageRequested(self).exit()
 
     def error_help(self, error):
-        print(self.formatter.error_info(self, error))
-        raise SystemExit
+        ArgumentError(self, error).exit()
 
     def print_help(self):
         print(self.help)
 
+    def _render_help(self, kind):
+        """render the help message of the formatter, and cache it"""
+        key = (kind, self.formatter.version)
+        text = self._help.get(key)
+        if text is None:
+            text = self._help[key] = getattr(self.formatter, kind)(self)
+        return text
+
     def _recover_help(self, args):
         for arg in args:
             if arg in ('-h', '--help'):
                 return True
         return False
 
-    def _parse(self, args, is_last):
+    def _parse(self, args, is_last, exit_on_error):
         index = 0
         while True:
             ele = args.peek()
@@ -933,13 +1207,15 @@ class ArgumentParser:
                 args.inc
                 continue
             if ele.startswith('-'):  # get optional
-                for arg in self.optional_args:
-                    if arg == ele:
-                        args.inc
-                        arg.consume(args)
-                        break
-                else:
-                    raise ValueError(f"Cannot understand option {ele}")
+                try:
+                    arg = self.optional_args.get(ele)
+                except ValueError as e:
+                    # ambiguous abbreviation
+                    raise UnknownOptionError(self, e) from None
+                if arg is None:
+                    raise UnknownOptionError(self, f"Cannot understand option {ele}")
+                args.inc
+                arg.consume(args)
             else:
                 if index < len(self.args):
                     arg = self.args[index]
@@ -957,54 +1233,175 @@ class ArgumentParser:
         else:
             for i, child in enumerate(self.children, start=1):
                 parser = child.consume(args)
-                parser.parse(args=args, is_last=(i == nchildren))
+                parser.parse(args=args, is_last=(i == nchildren), exit_on_error=exit_on_error)
 
     def _check_optionals(self):
         errors = self.optional_args.check_answers()
         if errors is None:
             return
-        error = "\n".join(f"option '{name}': {error}"for name, error in errors.items())
-        self.error_help(error)
+        message = "\n".join(f"option '{name}': {error}" for name, error in errors.items())
+        raise InvalidValueError(self, message)
 
     def _check_final(self, index, args):
         if index != len(self.args):
-            self.error_help(Exception("Too few arguments"))
+            raise TooFewArgumentsError(self, "Too few arguments")
         if args.get_next() is not None:
-            self.error_help(Exception("Too many arguments"))
+            raise TooManyArgumentsError(self, "Too many arguments")
 
 
 class MainArgumentParser(ArgumentParser):
 
-    def __init__(self, qform, *, name=None, formatter=None, parent=None, comment=None):
-        super().__init__(name=name, formatter=formatter, parent=parent, comment=comment)
+    def __init__(self, qform, *, name=None, formatter=None, parent=None, comment=None,
+                 allow_abbrev=True, single_dash_long=False):
+        super().__init__(name=name, formatter=formatter, parent=parent, comment=comment,
+                         allow_abbrev=allow_abbrev, single_dash_long=single_dash_long)
         self._qform = qform
+        self._select_hooks = []
 
-    def get_answers(self, *, args=None, is_last=True):
+    def case_selected(self, subparser, case):
+        """call the hooks registered with `on_case_selected`"""
+        for hook in self._select_hooks:
+            hook(subparser, case)
+
+    @contextmanager
+    def on_case_selected(self, hook):
+        """Call `hook(subparser, case)` whenever a case of a `SubParser` is selected
+        while parsing inside the context, e.g. to start work for that case early"""
+        self._select_hooks.append(hook)
+        try:
+            yield self
+        finally:
+            self._select_hooks.remove(hook)
+
+    def get_answers(self, *, args=None, is_last=True, exit_on_error=True):
+        """Parse the commandline arguments and return the answers
+
+        Raises
+        ------
+        ArgumentParserError
+            if `exit_on_error` is False and the arguments could not be parsed
+            or not all answers are defined
+
+        ColtErrorAnswerNotDefined
+            if `exit_on_error` is True and not all answers are defined
+        """
+        if exit_on_error is False:
+            answers, error = self.try_get_answers(args=args, is_last=is_last)
+            if error is not None:
+                raise error
+            return answers
         self.parse(args=args, is_last=is_last)
         return self._qform.get_answers()
 
+    def try_get_answers(self, *, args=None, is_last=True):
+        """Parse the commandline arguments, without printing, exiting or raising
+
+        Returns
+        -------
+        ParseResult
+            (answers, None) on success, else (None, error) with the ArgumentParserError
+        """
+        try:
+            self.parse(args=args, is_last=is_last, exit_on_error=False)
+        except ArgumentParserError as error:
+            return ParseResult(None, error)
+        answers, errors = self._qform.get_answers_and_errors()
+        if errors is not None:
+            return ParseResult(None, AnswersNotDefinedError(self, errors))
+        return ParseResult(answers, None)
+
+    def parse_many(self, argvs, *, processes=None, chunksize=64):
+        """Parse many lists of commandline arguments, without printing or exiting
+
+        The answers are reset to their initial state before each list is parsed,
+        the results do not share mutable values, e.g. lists.
+
+        Parameters
+        ----------
+        argvs: iterable(list(str))
+            commandline arguments, each without the program name
+
+        processes: int, optional
+            if larger than one, parse in that many forked processes
+
+        chunksize: int, optional
+            number of argument lists send to a process at once
+
+        Returns
+        -------
+        list
+            for each list of arguments, either the AnswersBlock or the ArgumentParserError
+        """
+        if processes is None or processes < 2 or not _can_fork():
+            return [self._parse_one(argv) for argv in argvs]
+        global _BATCH_PARSER
+        _BATCH_PARSER = self
+        try:
+            with multiprocessing.get_context('fork').Pool(processes) as pool:
+                return pool.map(_parse_with_batch_parser, argvs, chunksize)
+        finally:
+            _BATCH_PARSER = None
+
+    def _parse_one(self, argv):
+        self.reset()
+        answers, error = self.try_get_answers(args=SysIterator(list(argv)))
+        if error is not None:
+            return error
+        return answers
+
+    def save_state(self):
+        """save the current answers of the question form as the initial state"""
+        self._qform.save_state()
+
+    def reset(self):
+        """reset the answers to the state after the parser was created,
+        the parser itself is not changed"""
+        self._qform.reset()
+
+
+# parser used by the forked processes of `MainArgumentParser.parse_many`
+_BATCH_PARSER = None
+
+
+def _parse_with_batch_parser(argv):
+    return _BATCH_PARSER._parse_one(argv)
+
+
+def _can_fork():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
 
 class CommandlineParserVisitor(QuestionVisitor):
     """QuestionVisitor to create Commandline arguments"""
 
-    __slots__ = ('parser', 'block_name', 'formatter', 'is_subblock')
+    __slots__ = ('parser', 'block_name', 'formatter', 'is_subblock', 'qform', 'single_dash_long',
+                 'bool_flags')
 
-    def __init__(self, formatter):
+    def __init__(self, formatter, *, single_dash_long=False, bool_flags=True):
         """ """
         self.formatter = formatter
+        self.single_dash_long = single_dash_long
+        self.bool_flags = bool_flags
         self.parser = None
         self.block_name = None
         self.is_subblock = False
+        self.qform = None
 
     def visit_qform(self, qform):
         """Create basic argument parser with `description` and RawTextHelpFormatter"""
         self.is_subblock = False
-        parser = MainArgumentParser(qform, formatter=self.formatter)
+        self.qform = qform
+        parser = MainArgumentParser(qform, formatter=self.formatter,
+                                    single_dash_long=self.single_dash_long)
         self.parser = parser
         # visit all forms
-        qform.form.accept(self)
+        with profile('CommandlineParserVisitor', 'parser'):
+            qform.form.accept(self)
+        # store initial answers, to be able to reset the parser
+        parser.save_state()
         # return the parser
         self.parser = None
+        self.qform = None
         #
         return parser
 
@@ -1036,7 +1433,7 @@ class CommandlineParserVisitor(QuestionVisitor):
     def select_and_add_concrete_to_parser(self, question, *, is_hidden=False):
         if question.has_only_one_choice is True:
             self.set_answer(question, question.choices[0])
-        elif question.typ == 'bool':
+        elif question.typ == 'bool' and self.bool_flags is True:
             self.add_boolset_to_parser(question, is_hidden=is_hidden)
         else:
             self.add_concrete_to_parser(question, is_hidden=is_hidden)
@@ -1075,16 +1472,35 @@ class CommandlineParserVisitor(QuestionVisitor):
         """do nothing when visiting literal blocks"""
 
     def visit_subquestion_block(self, block):
-        """When visiting subquestion block create subparsers"""
-        # create subparser
-        # add subblocks
+        """When visiting subquestion block create subparsers, the parsers
+        of the cases are only created once the case is selected"""
         with self.blockname_and_parser() as (block_name, parser):
             subparser = parser.add_subparser(block.main_question.name, block.main_question)
             for case, subblock in block.cases.items():
+                subparser.add_lazy_parser(case, self._case_builder(subparser, case, block),
+                                          comment=subblock.comment)
+
+    def _case_builder(self, subparser, case, block):
+        """Return the function that creates the parser of a case"""
+        qform = self.qform
+
+        def _build():
+            # the questions of the case might only be loaded now
+            subblock = block.get_case(case)
+            is_subblock, active_qform = self.is_subblock, self.qform
+            with self.blockname_and_parser():
                 self.block_name = None
-                self.parser = subparser.add_parser(case, self.formatter, comment=subblock.comment)
+                self.parser = parser = subparser.add_parser(case, self.formatter,
+                                                            comment=subblock.comment)
                 self.is_subblock = True
+                self.qform = qform
                 subblock.accept(self)
+            self.is_subblock, self.qform = is_subblock, active_qform
+            # answers set while visiting are part of the initial state
+            qform.save_state(subblock)
+            return parser
+
+        return _build
 
     def add_concrete_to_parser(self, question, *, is_hidden=False):
         """adds a concrete question to the current active parser"""
@@ -1117,7 +1533,8 @@ class CommandlineParserVisitor(QuestionVisitor):
         return default, name
 
 
-def get_commandline_parser(questions, *, formatter=None, description=None, presets=None):
+def get_commandline_parser(questions, *, formatter=None, description=None, presets=None,
+                           single_dash_long=False, bool_flags=True):
     """Create the argparser from a given questions object and return the answers
 
     Parameters
@@ -1131,6 +1548,12 @@ def get_commandline_parser(questions, *, formatter=None, description=None, prese
     presets: str, optional
         presets used for the questions form
 
+    single_dash_long: bool, optional
+        if True, long options can also be given with a single dash, e.g. `-factor`
+
+    bool_flags: bool, optional
+        if True, bool options toggle their default, else they take a value, e.g. `-screening False`
+
     Returns
     -------
     AnswersBlock
@@ -1139,7 +1562,8 @@ def get_commandline_parser(questions, *, formatter=None, description=None, prese
     # Visitor object
     if formatter is None:
         formatter = HelpFormatter(settings=description)
-    visitor = CommandlineParserVisitor(formatter)
+    visitor = CommandlineParserVisitor(formatter, single_dash_long=single_dash_long,
+                                       bool_flags=bool_flags)
     #
     qform = QuestionForm(questions, presets=presets)
     #
@@ -1149,7 +1573,10 @@ def get_commandline_parser(questions, *, formatter=None, description=None, prese
 def get_config_from_commandline(questions, *, formatter=None,
                                 only_print_help=False,
                                 description=None,
-                                presets=None):
+                                presets=None,
+                                args=None,
+                                single_dash_long=False,
+                                bool_flags=True):
     """Create the argparser from a given questions object and return the answers
 
     Parameters
@@ -1163,6 +1590,15 @@ def get_config_from_commandline(questions, *, formatter=None,
     presets: str, optional
         presets used for the questions form
 
+    args: list(str), optional
+        commandline arguments, by default sys.argv[1:]
+
+    single_dash_long: bool, optional
+        if True, long options can also be given with a single dash, e.g. `-factor`
+
+    bool_flags: bool, optional
+        if True, bool options toggle their default, else they take a value, e.g. `-screening False`
+
     Returns
     -------
     AnswersBlock
@@ -1170,6 +1606,8 @@ def get_config_from_commandline(questions, *, formatter=None,
     """
     # Visitor object
     parser = get_commandline_parser(questions, formatter=formatter,
-                                    description=description, presets=presets)
+                                    description=description, presets=presets,
+                                    single_dash_long=single_dash_long,
+                                    bool_flags=bool_flags)
     # parse commandline args
-    return parser.get_answers()
+    return parser.get_answers(args=SysIterator(args))
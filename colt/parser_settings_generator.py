@@ -1,3 +1,5 @@
+from collections.abc import Mapping
+#
 from .parser import HelpFormatter
 from .colt import Colt
 
@@ -70,19 +72,20 @@ class HelpFormatterGenerator(Colt):
     """
 
     def from_config(cls, config):
-        settings = config.to_dict()
+        # remove_none_entries creates the only copy of the answers
+        settings = remove_none_entries(config)
         for key in ('seperator', 'block_seperator'):
             settings[key] = unescape(settings[key])
-        res = remove_none_entries(settings)
-        return res
+        return settings
 
 
 def remove_none_entries(dct):
+    """return a nested dict of the mapping `dct` without None values and empty blocks"""
     out = {}
     for key, value in dct.items():
         if value is None:
             continue
-        if isinstance(value, dict):
+        if isinstance(value, Mapping):
             value = remove_none_entries(value)
             if len(value) != 0:
                 out[key] = value
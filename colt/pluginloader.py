@@ -1,10 +1,30 @@
 """Load Plugins from a given folder, basically calls `import module` for all modules
 in the plugin folder, that are not explicitly ignored"""
+import hashlib
 import importlib.util
 from importlib import import_module
+import json
 import os
 import re
 import sys
+from collections import namedtuple
+#
+from .colt import no_extend_user_input
+from .lazyimport import LazyImport
+from .plugins import record_plugins, replay_plugins
+from .profiler import profile
+from .questions import QuestionASTGenerator
+
+
+# only needed to compile the bytecode in parallel
+compileall = LazyImport('compileall')
+multiprocessing = LazyImport('multiprocessing')
+
+MANIFEST_VERSION = 1
+
+CachedModule = namedtuple('CachedModule', ('stat', 'module', 'plugins'))
+# modules imported by the PluginLoader, {absolute path: CachedModule}
+_MODULES = {}
 
 
 def save_import(module):
@@ -50,11 +70,70 @@ class _FailedImport:
         raise self.error
 
 
+class _LazyModule:
+    """File or package in the plugin folder that is imported at most once"""
+
+    __slots__ = ('path', 'is_loaded')
+
+    def __init__(self, path):
+        self.path = path
+        self.is_loaded = False
+
+    def load(self):
+        if self.is_loaded is False:
+            PluginLoader.import_path(self.path)
+            self.is_loaded = True
+
+
+class LazyPlugin:
+    """Stub of a plugin listed in a plugin manifest
+
+    The stub provides the questions of the plugin, its module is only imported
+    once any other attribute, e.g. `from_config`, is requested. On import the
+    real plugin class replaces the stub in the plugin storage.
+    """
+
+    __slots__ = ('name', 'factory', 'module', '_user_input', '_colt_description', '_plugin')
+
+    def __init__(self, name, factory, module, user_input, description):
+        self.name = name
+        self.factory = factory
+        self.module = module
+        self._user_input = user_input
+        self._colt_description = description
+        self._plugin = None
+
+    @property
+    def colt_user_input(self):
+        return QuestionASTGenerator(self._user_input, comment=self._colt_description)
+
+    def _colt_fingerprint(self):
+        # same fingerprint as the real plugin, see `ColtMeta._colt_fingerprint`
+        return (self._user_input, self._colt_description, no_extend_user_input)
+
+    def load(self):
+        """Import the module of the plugin and return the plugin class"""
+        if self._plugin is None:
+            self.module.load()
+            plugin = self.factory.plugins.get(self.name)
+            if plugin is None or plugin is self:
+                raise ImportError(f"Plugin '{self.name}' not defined in '{self.module.path}'")
+            self._plugin = plugin
+        return self._plugin
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        return f"LazyPlugin({self.name}, path={self.module.path})"
+
+
 class PluginLoader:
     """Plugin Loader for Colt's Plugin system"""
-    __slots__ = ('ignore',)
+    __slots__ = ('ignore', 'reload')
 
-    def __init__(self, folder, *, ignorefile=None):
+    def __init__(self, folder, *, ignorefile=None, manifest=None, processes=None,
+                 reload=False):
         """Setup a Plugin Loader for Colt's Plugin system
         Parameters
         ----------
@@ -64,6 +143,22 @@ class PluginLoader:
         ignorefile: str, optional
             if given, load pattern from ignorefile to load only specific files
 
+        manifest: str, optional
+            if given, name of the plugin manifest in the folder. Plugins listed
+            in the manifest are registered as `LazyPlugin` and only imported
+            when they are used. Files that are new or changed are imported and
+            the manifest is updated, if it does not exist, it is created.
+
+        processes: int, optional
+            if larger than one, the bytecode of all files is compiled in that
+            many processes before the files are imported, used without manifest
+
+        reload: bool, optional
+            files are imported only once per process, loading them again
+            returns the cached module. If True, files that changed since
+            they were imported are executed again, for module folders
+            `importlib.reload` is used
+
         Examples
         --------
         A basic `ignorefile` can look like the following, the syntax is adopted
@@ -77,62 +172,152 @@ class PluginLoader:
         !important.py    # Do not ignore `important.py` files!
         ----------------------------------------
         """
+        self.reload = reload
         # setup self ignore
         if ignorefile is None:
             self.ignore = lambda x: False
         else:
             self.ignore = IgnorePattern(folder, ignorefile=ignorefile)
         #
-        if os.path.isdir(folder):
-            self._import_folder(folder)
-
-    def _import_folder(self, folder):
-        """Import all files/folders in the folder, if the folder
-        contains an `__init__.py` file it is considered a
-        module and will be only _import_module will be called"""
-        if self.ignore(folder) is True:
-            return None
+        if not os.path.isdir(folder):
+            return
+        if manifest is None:
+            self._import_folder(folder, processes=processes)
+        else:
+            self._load_manifest(folder, os.path.join(folder, manifest))
+
+    def _import_folder(self, folder, processes=None):
+        """Import all files/folders in the folder"""
+        paths = list(self._find_modules(folder))
+        if (processes is not None and processes > 1 and len(paths) > 1
+                and not sys.dont_write_bytecode):
+            compile_bytecode(paths, processes)
+        for path in paths:
+            self.import_path(path, reload=self.reload)
+
+    def _find_modules(self, folder):
+        """Yield all files/folders in the folder that should be imported, sorted
+        by name. If the folder contains an `__init__.py` file it is considered
+        a module and only the folder itself is returned.
+
+        Each folder is read in a single `os.scandir` call, the type of the
+        entries is taken from the directory listing to avoid a stat per file.
+        Ignored folders are not scanned at all."""
+        with os.scandir(folder) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
         #
-        files = tuple(os.listdir(folder))
+        if any(entry.name == '__init__.py' for entry in entries):
+            yield folder
+            return
         #
-        if '__init__.py' in files:
-            return self._import_module(folder)
+        for entry in entries:
+            if entry.name == '__pycache__':
+                continue
+            if self.ignore(entry.path) is True:
+                continue
+            if entry.name.endswith('.py'):
+                yield entry.path
+            elif entry.is_dir():
+                yield from self._find_modules(entry.path)
+
+    def _load_manifest(self, folder, filename):
+        """Register the plugins in the manifest as `LazyPlugin`, import
+        everything that is not in the manifest and update it"""
+        modules = _read_manifest(filename)
+        entries = {}
+        changed = False
+        for path in self._find_modules(folder):
+            key = os.path.relpath(path, folder)
+            entry = modules.get(key)
+            if entry is not None:
+                stat = _stat(path)
+                if stat != (entry['mtime'], entry['size']):
+                    if _sha256(path) != entry['sha256']:
+                        entry = None
+                    else:
+                        entry['mtime'], entry['size'] = stat
+                        changed = True
+            if entry is None or self._register_lazy_plugins(path, entry['plugins']) is False:
+                entry = self._import_and_record(path, reload=self.reload)
+                changed = True
+            entries[key] = entry
         #
-        files = tuple(os.path.join(folder, filename) for filename in files)
+        if changed is True or entries.keys() != modules.keys():
+            _write_manifest(filename, entries)
+
+    @staticmethod
+    def _register_lazy_plugins(path, plugins):
+        """Register the plugins of a module as `LazyPlugin`, returns False
+        if the module needs to be imported"""
+        if len(plugins) == 0 or not all(plugin['lazy'] for plugin in plugins):
+            return False
+        factories = [_resolve(plugin['factory']) for plugin in plugins]
+        if any(factory is None for factory in factories):
+            return False
         #
-        for filename in files:
-            if filename.endswith('__pycache__'):
+        module = _LazyModule(path)
+        for plugin, factory in zip(plugins, factories):
+            if plugin['name'] in factory.plugins:
                 continue
-            if self.ignore(filename) is True:
-                continue
-            if filename.endswith('.py'):
-                self._import_file(filename)
-            elif os.path.isdir(filename):
-                self._import_folder(filename)
-        return None
+            factory.add_plugin(plugin['name'],
+                               LazyPlugin(plugin['name'], factory, module,
+                                          plugin['user_input'], plugin['description']))
+        return True
+
+    @classmethod
+    def _import_and_record(cls, path, reload=False):
+        """Import the file/folder and return its manifest entry"""
+        with record_plugins() as plugins:
+            cls.import_path(path, reload=reload)
+        mtime, size = _stat(path)
+        return {'mtime': mtime, 'size': size, 'sha256': _sha256(path),
+                'plugins': [_plugin_entry(*plugin) for plugin in plugins]}
+
+    @classmethod
+    def import_path(cls, path, *, reload=False):
+        """Import a file or a module folder, each is imported only once,
+        unless `reload` is True and it changed since the last import"""
+        abspath = os.path.abspath(path)
+        cached = _MODULES.get(abspath)
+        if cached is not None:
+            if reload is False or cached.stat == _stat(abspath):
+                replay_plugins(cached.plugins)
+                return cached.module
+        #
+        stat = _stat(abspath)
+        with record_plugins() as plugins:
+            if path.endswith('.py'):
+                module = cls._import_file(path)
+            else:
+                module = cls._import_module(path, reload=cached is not None)
+        _MODULES[abspath] = CachedModule(stat, module, tuple(plugins))
+        return module
 
     @staticmethod
-    def _import_module(folderpath):
+    def _import_module(folderpath, reload=False):
         """import a module"""
         path, name = os.path.split(folderpath)
         with AddFolderToPath(path):
             try:
-                importlib.import_module(name)
-                return
+                module = importlib.import_module(name)
+                if reload is True:
+                    module = importlib.reload(module)
+                return module
             except Exception:
                 pass
         raise ImportError(f"Could not load module: {folderpath}")
 
     @staticmethod
     def _import_file(filepath):
-        """Import a file"""
+        """Import a file, the module is not added to `sys.modules`"""
         _, name = os.path.split(filepath)
         # rm .py
         name = name[:-3]
         spec = importlib.util.spec_from_file_location(name, filepath)
         module = importlib.util.module_from_spec(spec)
         try:
-            spec.loader.exec_module(module)
+            with profile(filepath, 'import'):
+                spec.loader.exec_module(module)
             return module
         except Exception:
             pass
@@ -140,6 +325,111 @@ class PluginLoader:
         raise ImportError(f"Could not load file: {filepath}")
 
 
+def clear_module_cache():
+    """Forget all imported plugin files, loading them again executes them again"""
+    _MODULES.clear()
+
+
+def _compile(path):
+    """compile the bytecode of a file or module folder, if it is outdated"""
+    if path.endswith('.py'):
+        return compileall.compile_file(path, quiet=2)
+    return compileall.compile_dir(path, quiet=2)
+
+
+def compile_bytecode(paths, processes):
+    """Compile the bytecode of the files/module folders in parallel,
+    files that cannot be compiled are reported on import"""
+    with multiprocessing.Pool(processes) as pool:
+        pool.map(_compile, paths, chunksize=max(1, len(paths) // (4*processes)))
+
+
+def _module_files(path):
+    """all python files of a file or module folder, in a fixed order"""
+    if not os.path.isdir(path):
+        return [path]
+    files = []
+    for root, dirs, filenames in os.walk(path):
+        dirs[:] = sorted(folder for folder in dirs if folder != '__pycache__')
+        files += [os.path.join(root, filename) for filename in sorted(filenames)
+                  if filename.endswith('.py')]
+    return files
+
+
+def _stat(path):
+    """(mtime, size) of a file, for module folders the latest mtime and the total size"""
+    mtime = size = 0
+    for filename in _module_files(path):
+        stat = os.stat(filename)
+        mtime = max(mtime, stat.st_mtime_ns)
+        size += stat.st_size
+    return mtime, size
+
+
+def _sha256(path):
+    """sha256 of the content of a file or all python files of a module folder"""
+    sha = hashlib.sha256()
+    for filename in _module_files(path):
+        with open(filename, 'rb') as fhandle:
+            sha.update(fhandle.read())
+    return sha.hexdigest()
+
+
+def _resolve(reference):
+    """Return the object of a `module:qualname` reference, None if it cannot be found"""
+    module_name, _, qualname = reference.partition(':')
+    try:
+        obj = sys.modules.get(module_name)
+        if obj is None:
+            obj = import_module(module_name)
+        for attr in qualname.split('.'):
+            obj = getattr(obj, attr)
+    except Exception:
+        return None
+    return obj
+
+
+def _plugin_entry(name, plugin, factory):
+    """Manifest entry of a registered plugin, only plugins whose questions can be
+    generated from the manifest and whose factory can be imported are lazy"""
+    reference = f"{factory.__module__}:{factory.__qualname__}"
+    user_input = getattr(plugin, '_user_input', None)
+    description = getattr(plugin, '_colt_description', None)
+    extend_user_input = getattr(plugin._extend_user_input, '__func__', None)
+    lazy = (isinstance(user_input, str) and isinstance(description, (str, type(None)))
+            and extend_user_input is no_extend_user_input and _resolve(reference) is factory)
+    if lazy is False:
+        user_input = description = None
+    return {'name': name, 'factory': reference, 'user_input': user_input,
+            'description': description, 'lazy': lazy}
+
+
+def _read_manifest(filename):
+    """Return the modules in the manifest, empty if it does not exist or is outdated"""
+    try:
+        with open(filename, 'r') as fhandle:
+            manifest = json.load(fhandle)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return {}
+    return manifest.get('modules', {})
+
+
+def _write_manifest(filename, modules):
+    """Write the manifest, a read-only plugin folder is not an error"""
+    tmpfile = f"{filename}.{os.getpid()}.tmp"
+    try:
+        with open(tmpfile, 'w') as fhandle:
+            json.dump({'version': MANIFEST_VERSION, 'modules': modules}, fhandle, indent=1)
+        os.replace(tmpfile, filename)
+    except OSError:
+        try:
+            os.remove(tmpfile)
+        except OSError:
+            pass
+
+
 def get_matcher(pattern):
     """Returns the matcher for a given pattern
     Parameters
@@ -221,18 +511,58 @@ class PathMatcherGlobal(PathMatcher):
         """Get only the part of the path that should be matched!"""
         if self.nlevel == 1:
             return os.path.basename(path)
-        paths = []
-        for _ in range(self.nlevel):
-            if path == '':
-                return path
-            paths.append(os.path.basename(path))
-            path = os.path.dirname(path)
-        paths.reverse()
-        #
-        out_path = ''
-        for _path in paths:
-            out_path = os.path.join(out_path, _path)
-        return out_path
+        return _path_suffix(path.split(os.sep), self.nlevel)
+
+
+def _path_suffix(parts, nlevel):
+    """the last `nlevel` parts of a path, empty if the path is shorter"""
+    if len(parts) < nlevel:
+        return ''
+    return os.sep.join(parts[-nlevel:])
+
+
+def _combine(patterns):
+    """one regex that matches if any of the patterns matches, None if there are no patterns"""
+    if len(patterns) == 0:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
+
+
+class CombinedMatcher:
+    """All matchers of an ignore file compiled into a single regex per
+    path depth, so that each path is tested only once per depth"""
+
+    __slots__ = ('full', 'suffixes')
+
+    def __init__(self, matchers):
+        """
+        Parameters
+        ----------
+        matchers: list(PathMatcher)
+            matchers to be combined
+        """
+        patterns = {}
+        for matcher in matchers:
+            # nlevel 0: match the full path
+            nlevel = getattr(matcher, 'nlevel', 0)
+            patterns.setdefault(nlevel, []).append(matcher.pattern.pattern)
+        self.full = _combine(patterns.pop(0, []))
+        self.suffixes = tuple((nlevel, _combine(patterns[nlevel]))
+                              for nlevel in sorted(patterns))
+
+    def match(self, path):
+        """Check if path matches any of the patterns"""
+        if path == '':
+            return False
+        if self.full is not None and self.full.match(path) is not None:
+            return True
+        parts = path.split(os.sep)
+        for nlevel, pattern in self.suffixes:
+            if nlevel > len(parts):
+                break
+            if pattern.match(_path_suffix(parts, nlevel)) is not None:
+                return True
+        return False
 
 
 class IgnorePattern:
@@ -257,10 +587,10 @@ class IgnorePattern:
         #
         self.folder = folder
         patterns = self._load_ignorefile(os.path.join(folder, ignorefile))
-        self.matchers = [get_matcher(pattern) for pattern in patterns
-                         if not pattern.startswith('!')]
-        self.non_matchers = [get_matcher(pattern[1:]) for pattern in patterns
-                             if pattern.startswith('!')]
+        self.matchers = CombinedMatcher([get_matcher(pattern) for pattern in patterns
+                                         if not pattern.startswith('!')])
+        self.non_matchers = CombinedMatcher([get_matcher(pattern[1:]) for pattern in patterns
+                                             if pattern.startswith('!')])
 
     @staticmethod
     def _load_ignorefile(filename):
@@ -279,18 +609,13 @@ class IgnorePattern:
         return out
 
     def __call__(self, filename):
-        """Loop over all matchers and see if something should be ignored"""
+        """Check the combined matchers to see if something should be ignored"""
         filename = filename[self.nignore:]
         # if entry in non_matcher -> do not ignore the entry
-        for matcher in self.non_matchers:
-            if matcher.match(filename) is True:
-                return False
+        if self.non_matchers.match(filename) is True:
+            return False
         # if entry in matcher -> do ignore the entry
-        for matcher in self.matchers:
-            if matcher.match(filename) is True:
-                return True
-        # do not ignore the entry
-        return False
+        return self.matchers.match(filename)
 
 
 class AddFolderToPath:
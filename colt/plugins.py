@@ -1,7 +1,196 @@
+from bisect import bisect_left
+from contextlib import contextmanager
+#
 from .colt import Colt, ColtMeta
 from .colt import add_defaults_to_dict, delete_inherited_keys
 
 
+# list of (name, plugin, storage class) of the active `record_plugins` context
+_RECORDED_PLUGINS = None
+
+
+@contextmanager
+def record_plugins():
+    """Record all plugins registered inside the context
+
+    Yields
+    ------
+    list
+        (name, plugin class, storage class) of each registration
+    """
+    global _RECORDED_PLUGINS
+    previous, _RECORDED_PLUGINS = _RECORDED_PLUGINS, []
+    try:
+        yield _RECORDED_PLUGINS
+    finally:
+        if previous is not None:
+            previous.extend(_RECORDED_PLUGINS)
+        _RECORDED_PLUGINS = previous
+
+
+def replay_plugins(plugins):
+    """Add plugins that were recorded before to the active `record_plugins` context"""
+    if _RECORDED_PLUGINS is not None:
+        _RECORDED_PLUGINS.extend(plugins)
+
+
+class PluginStorage(dict):
+    """Storage of the plugins of a plugin factory, {name: plugin}
+
+    Besides the normal dict access by name, `resolve` finds plugins by alias,
+    case-insensitive name and unique prefix, all in O(1) or O(log n).
+    Aliases are taken from the `_plugin_aliases` of the plugin classes or
+    can be added using `add_alias`.
+    """
+
+    def __init__(self, plugins=(), aliases=None):
+        super().__init__()
+        # {alias: name}
+        self._aliases = {}
+        # {case-folded name or alias: set of names}
+        self._folded = {}
+        # sorted keys of _folded for the prefix search, None if outdated
+        self._sorted = None
+        self.update(plugins)
+        if aliases is not None:
+            for alias, name in aliases.items():
+                self.add_alias(alias, name)
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self), self._aliases))
+
+    def __setitem__(self, name, plugin):
+        if name in self:
+            self._remove_index(name)
+        super().__setitem__(name, plugin)
+        self._add_index(name, name)
+        # do not use getattr, lazy plugins would be loaded
+        if isinstance(plugin, type):
+            for alias in plugin.__dict__.get('_plugin_aliases', ()):
+                self.add_alias(alias, name)
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        self._remove_index(name)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def add_alias(self, alias, name):
+        """Add an alias for the plugin `name`"""
+        if name not in self:
+            raise KeyError(f"Cannot add alias '{alias}', plugin '{name}' unknown")
+        old = self._aliases.get(alias)
+        if old is not None:
+            self._unfold(alias, old)
+        self._aliases[alias] = name
+        self._add_index(alias, name)
+
+    @property
+    def aliases(self):
+        """{alias: name}"""
+        return dict(self._aliases)
+
+    def resolve_name(self, key):
+        """Return the name of the plugin given by its name, an alias, the
+        case-insensitive name or alias, or a unique prefix of those
+
+        Raises
+        ------
+        KeyError
+            if no plugin, or more than one plugin is found
+        """
+        if key in self:
+            return key
+        name = self._aliases.get(key)
+        if name is not None:
+            return name
+        if not isinstance(key, str):
+            raise KeyError(key)
+        folded = key.casefold()
+        names = self._folded.get(folded)
+        if names is None:
+            names = self._find_prefix(folded)
+        if len(names) == 1:
+            return next(iter(names))
+        if len(names) == 0:
+            raise KeyError(f"Plugin '{key}' unknown, select from: {', '.join(map(str, self))}")
+        raise KeyError(f"Plugin '{key}' is ambiguous, could be: {', '.join(sorted(names))}")
+
+    def resolve(self, key):
+        """Return the plugin for a name, alias, case-insensitive name or unique prefix,
+        see `resolve_name`"""
+        return self[self.resolve_name(key)]
+
+    def pop(self, name, *default):
+        if name not in self:
+            return super().pop(name, *default)
+        value = super().pop(name)
+        self._remove_index(name)
+        return value
+
+    def popitem(self):
+        name, value = super().popitem()
+        self._remove_index(name)
+        return name, value
+
+    def clear(self):
+        super().clear()
+        self._aliases.clear()
+        self._folded.clear()
+        self._sorted = None
+
+    def setdefault(self, name, default=None):
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs):
+        for name, plugin in dict(*args, **kwargs).items():
+            self[name] = plugin
+
+    def copy(self):
+        return self.__class__(self, self._aliases)
+
+    def _find_prefix(self, folded):
+        """names of all plugins that have a name or alias starting with `folded`"""
+        if self._sorted is None:
+            self._sorted = sorted(self._folded)
+        names = set()
+        for key in self._sorted[bisect_left(self._sorted, folded):]:
+            if not key.startswith(folded):
+                break
+            names |= self._folded[key]
+        return names
+
+    def _add_index(self, key, name):
+        # only strings are found case-insensitive or by prefix
+        if not isinstance(key, str) or not isinstance(name, str):
+            return
+        self._folded.setdefault(key.casefold(), set()).add(name)
+        self._sorted = None
+
+    def _unfold(self, key, name):
+        if not isinstance(key, str):
+            return
+        folded = key.casefold()
+        names = self._folded.get(folded)
+        if names is None:
+            return
+        names.discard(name)
+        if len(names) == 0:
+            del self._folded[folded]
+        self._sorted = None
+
+    def _remove_index(self, name):
+        """remove the name and all its aliases from the indices"""
+        self._unfold(name, name)
+        for alias in [alias for alias, target in self._aliases.items() if target == name]:
+            del self._aliases[alias]
+            self._unfold(alias, name)
+
+
 def plugin_meta_setup(clsdict):
     plugin_defaults = {
         '_register_plugin': True,
@@ -57,6 +246,8 @@ class PluginMeta(ColtMeta):
         # store plugin in all stoarge classes
         for storage_class in plugin_storage_classes:
             storage_class.add_plugin(name, cls)
+            if _RECORDED_PLUGINS is not None:
+                _RECORDED_PLUGINS.append((name, cls, storage_class))
 
     def __get_storage_classes(cls):
         """return all relevant storage classes"""
@@ -79,9 +270,18 @@ class PluginMeta(ColtMeta):
             idx = idx[0]
         return storage_classes, idx
 
+    def _colt_fingerprint(cls):
+        """Fingerprint of the questions, plugin factories include
+        the fingerprints of all their plugins"""
+        fingerprint = ColtMeta._colt_fingerprint(cls)
+        if getattr(cls, '_is_plugin_factory', False) is not True:
+            return fingerprint
+        return fingerprint + tuple((name, plugin._colt_fingerprint())
+                                   for name, plugin in cls.plugins.items())
+
     def __new_plugin_storage(cls):
         """create new plugin storage"""
-        setattr(cls, cls._plugins_storage, {})
+        setattr(cls, cls._plugins_storage, PluginStorage())
 
 
 class PluginStorageDescriptor:
@@ -109,4 +309,4 @@ class Plugin(Colt, metaclass=PluginMeta):
     @classmethod
     def plugin_from_config(cls, config, *args, **kwargs):
         """has to be the correct setting"""
-        return cls.plugins[config.value].from_config(config, *args, **kwargs)
+        return cls.plugins.resolve(config.value)._from_config(config, *args, **kwargs)
@@ -53,6 +53,12 @@ class PresetGenerator(Generator):
                 dct[key] = value
         return dct
 
+    def _create_block(self, tree, entry):
+        """blocks are stored by their full name, e.g. `method(cis)::states`"""
+        if entry.name not in tree:
+            tree[entry.name] = self.new_node(comment=entry.comment)
+        return tree[entry.name]
+
     @staticmethod
     def _is_subblock(block):
         """prevent creation of subblocks!"""
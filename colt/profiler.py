@@ -0,0 +1,212 @@
+"""Startup profiler for colt based programs
+
+Set the environment variable `COLT_PROFILE=1` to record the wall time and the
+allocated memory of colt's phases: plugin imports, class creation, question
+generation, form construction, applying presets and parser construction.
+At exit a report sorted by time is printed to stderr, or, if
+`COLT_PROFILE_OUTPUT` is set, a Chrome trace (chrome://tracing) is written
+to that file.
+
+Times and allocations are inclusive, nested phases are counted in their parents.
+"""
+import atexit
+import json
+import os
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+
+__all__ = ["Profiler", "profile", "enable", "disable", "get_profiler"]
+
+
+Event = namedtuple("Event", ("name", "category", "start", "duration", "alloc", "depth"))
+
+
+class _Phase:
+    """Context manager recording a single phase"""
+
+    __slots__ = ('profiler', 'name', 'category', 'start', 'memory')
+
+    def __init__(self, profiler, name, category):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.start = None
+        self.memory = None
+
+    def __enter__(self):
+        self.profiler.depth += 1
+        self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        duration = time.perf_counter() - self.start
+        alloc = tracemalloc.get_traced_memory()[0] - self.memory
+        self.profiler.depth -= 1
+        self.profiler.events.append(Event(self.name, self.category, self.start, duration,
+                                          alloc, self.profiler.depth))
+
+
+class _NoPhase:
+    """Context manager used if profiling is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_NO_PHASE = _NoPhase()
+
+
+class Profiler:
+    """Record the wall time and allocated memory of colt's phases"""
+
+    __slots__ = ('events', 'depth', 'start', '_tracemalloc')
+
+    def __init__(self):
+        self.events = []
+        self.depth = 0
+        self.start = time.perf_counter()
+        # only stop tracemalloc if it was started by the profiler
+        self._tracemalloc = not tracemalloc.is_tracing()
+        if self._tracemalloc:
+            tracemalloc.start()
+
+    def close(self):
+        """Stop tracing allocations"""
+        if self._tracemalloc:
+            tracemalloc.stop()
+            self._tracemalloc = False
+
+    def phase(self, name, category):
+        """Context manager to record a phase"""
+        return _Phase(self, name, category)
+
+    def summary(self):
+        """Return the events grouped by (category, name), sorted by time
+
+        Returns
+        -------
+        list
+            (category, name, calls, time, alloc)
+        """
+        summary = {}
+        for event in self.events:
+            key = (event.category, event.name)
+            calls, duration, alloc = summary.get(key, (0, 0.0, 0))
+            summary[key] = (calls + 1, duration + event.duration, alloc + event.alloc)
+        return sorted(((category, name, *values) for (category, name), values in summary.items()),
+                      key=lambda entry: entry[3], reverse=True)
+
+    def report(self):
+        """Return the sorted report as a string"""
+        lines = ["colt profile (inclusive wall time and allocated memory)",
+                 f"{'category':<10} {'calls':>6} {'time [ms]':>10} {'alloc [kB]':>11}  name"]
+        for category, name, calls, duration, alloc in self.summary():
+            lines.append(f"{category:<10} {calls:>6} {1000*duration:>10.2f} "
+                         f"{alloc/1024:>11.1f}  {name}")
+        return "\n".join(lines)
+
+    def chrome_trace(self):
+        """Return the events in Chrome's trace event format"""
+        pid = os.getpid()
+        return {"traceEvents": [{"name": event.name,
+                                 "cat": event.category,
+                                 "ph": "X",
+                                 "ts": 1e6*(event.start - self.start),
+                                 "dur": 1e6*event.duration,
+                                 "pid": pid,
+                                 "tid": 0,
+                                 "args": {"alloc_bytes": event.alloc}}
+                                for event in self.events],
+                "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, filename):
+        """Write the events as Chrome trace to `filename`"""
+        with open(filename, 'w') as fhandle:
+            json.dump(self.chrome_trace(), fhandle)
+
+
+_PROFILER = None
+# (profiler, output) reported at exit, the exit handler is only registered once
+_AT_EXIT = None
+
+
+def get_profiler():
+    """Return the active profiler, or None if profiling is disabled"""
+    return _PROFILER
+
+
+def profile(name, category, module=None):
+    """Context manager recording the phase `name`, does nothing if profiling is disabled
+
+    If `module` is given, the phase is recorded as `module.name`, the label
+    is only formatted if profiling is enabled.
+    """
+    if _PROFILER is None:
+        return _NO_PHASE
+    if module is not None:
+        name = f"{module}.{name}"
+    return _PROFILER.phase(name, category)
+
+
+def enable(output=None, *, report_at_exit=True):
+    """Enable profiling
+
+    Parameters
+    ----------
+    output: str, optional
+        if given, write a Chrome trace to that file at exit,
+        else print the report to stderr
+
+    report_at_exit: bool, optional
+        if False, nothing is written at exit, else a single report
+        is written, using the output of the last call
+
+    Returns
+    -------
+    Profiler
+        the active profiler
+    """
+    global _PROFILER, _AT_EXIT
+    if _PROFILER is None:
+        _PROFILER = Profiler()
+    if report_at_exit is True:
+        if _AT_EXIT is None:
+            atexit.register(_report_at_exit)
+        _AT_EXIT = (_PROFILER, output)
+    return _PROFILER
+
+
+def disable():
+    """Disable profiling, returns the profiler that was active,
+    nothing is reported at exit"""
+    global _PROFILER, _AT_EXIT
+    profiler, _PROFILER = _PROFILER, None
+    if _AT_EXIT is not None:
+        atexit.unregister(_report_at_exit)
+        _AT_EXIT = None
+    if profiler is not None:
+        profiler.close()
+    return profiler
+
+
+def _report_at_exit():
+    if _AT_EXIT is None:
+        return
+    profiler, output = _AT_EXIT
+    if output is None:
+        print(profiler.report(), file=sys.stderr)
+    else:
+        profiler.write_chrome_trace(output)
+
+
+if os.environ.get('COLT_PROFILE', '0') not in ('', '0'):
+    enable(os.environ.get('COLT_PROFILE_OUTPUT') or None)
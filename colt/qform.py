@@ -4,6 +4,7 @@ from collections.abc import Mapping
 from contextlib import contextmanager
 from io import StringIO
 import json
+import sys
 #
 from .answers import AnswersBlock, SubquestionsAnswer
 from .config import ConfigParser
@@ -14,6 +15,7 @@ from .questions import QuestionASTVisitor
 from .questions import Component
 #
 from .presets import PresetGenerator
+from .profiler import profile
 from .validator import Validator, NOT_DEFINED, file_exists, ListValidator
 from .validator import ValidatorErrorNotChoicesSubset, ValidatorErrorNotInChoices
 from .validator import Choices, RangeExpression
@@ -32,6 +34,11 @@ def split_keys(name):
     return block, key
 
 
+def _in_block(name, block):
+    """check if `name` is the block `block` or one of its subblocks"""
+    return name == block or name.startswith(f"{block}{GeneratorNavigator.seperator}")
+
+
 def is_existing_file(config):
     try:
         config = file_exists(config)
@@ -74,7 +81,10 @@ class _ConcreteQuestionBase(Component):
 
     def __init__(self, name):
         self.name = name
-        self.parent_name, self._name = split_keys(name)
+        # the short names repeat in every block, they are interned
+        parent_name, short_name = split_keys(name)
+        self.parent_name = sys.intern(parent_name)
+        self._name = sys.intern(short_name)
         self.is_set = False
 
     @property
@@ -110,6 +120,14 @@ class _ConcreteQuestionBase(Component):
     def preset(self, value, choices):
         """preset new value and choices!"""
 
+    @abstractmethod
+    def get_state(self):
+        """get the current answer state"""
+
+    @abstractmethod
+    def set_state(self, state):
+        """restore an answer state"""
+
     def set(self, answer, on_empty_entry=lambda answer, self: None,
             on_value_error=lambda answer, self: None, on_wrong_choice=lambda answer, self: None):
         """ Handle all set events """
@@ -186,6 +204,14 @@ class LiteralBlock(_ConcreteQuestionBase):
             return None
         return self._answer.data
 
+    def get_state(self):
+        """Return the current answer state"""
+        return (self.is_set, self._answer)
+
+    def set_state(self, state):
+        """Restore an answer state returned by `get_state`"""
+        self.is_set, self._answer = state
+
     def get_answer_as_string(self):
         """get string of answer"""
         if self._answer.is_none is True:
@@ -247,7 +273,8 @@ class ConcreteQuestion(_ConcreteQuestionBase):
 
     @property
     def has_only_one_choice(self):
-        return len(self.choices) == 1
+        choices = self.choices
+        return choices is not None and len(choices) == 1
 
     @property
     def comment(self):
@@ -290,6 +317,15 @@ class ConcreteQuestion(_ConcreteQuestionBase):
             return ''
         return self._value.answer_as_string()
 
+    def get_state(self):
+        """Return the current answer state"""
+        return (self.is_set, self.is_set_to_empty, self._value.get_state())
+
+    def set_state(self, state):
+        """Restore an answer state returned by `get_state`"""
+        self.is_set, self.is_set_to_empty, value_state = state
+        self._value.set_state(value_state)
+
     def accept(self, visitor):
         if self.is_hidden is True:
             return visitor.visit_concrete_question_hidden(self)
@@ -350,6 +386,12 @@ class QuestionBlock(_QuestionsContainerBase, UserDict):
         return sum((block.get_blocks() for block in self.blocks.values()),
                    [self.name])
 
+    def iter_questions(self):
+        """iterate over all questions in the block and all its subblocks"""
+        yield from self.concrete.values()
+        for block in self.blocks.values():
+            yield from block.iter_questions()
+
 
 class SubquestionBlock(_QuestionsContainerBase):
     """Container for the cases spliting"""
@@ -360,6 +402,25 @@ class SubquestionBlock(_QuestionsContainerBase):
         self.main_question = main_question
         #
         self.cases = cases
+        #
+        self._qform = parent
+        # {case: function returning the questions of the case}, see `set_case_loader`
+        self._loaders = {}
+
+    def set_case_loader(self, case, load):
+        """The questions of the (empty) `case` are only created by `load()`,
+        once the case is used, e.g. selected on the commandline"""
+        if case not in self.cases:
+            raise KeyError(f"Case '{case}' unknown")
+        self._loaders[case] = load
+        self._qform._lazy_cases.add(self.cases[case].name)
+
+    def get_case(self, case):
+        """Return the block of `case`, its questions are loaded if necessary"""
+        load = self._loaders.pop(case, None)
+        if load is not None:
+            self.cases[case] = self._qform.generate_case(self.cases[case], load())
+        return self.cases[case]
 
     @property
     def is_optional(self):
@@ -369,7 +430,7 @@ class SubquestionBlock(_QuestionsContainerBase):
         answer = self.answer
         if answer in ("", None):
             return {}
-        return self.cases[answer].generate_setup()
+        return self.get_case(answer).generate_setup()
 
     def accept(self, visitor):
         return visitor.visit_subquestion_block(self)
@@ -386,17 +447,22 @@ class SubquestionBlock(_QuestionsContainerBase):
         answer = self.answer
         if answer in ("", None):
             return []
-        return self.cases[answer].get_blocks()
+        return self.get_case(answer).get_blocks()
 
     def get_delete_blocks(self):
         return {block: None for block in self.get_blocks()}
 
+    def iter_questions(self):
+        """iterate over all questions in all cases"""
+        for case in self.cases.values():
+            yield from case.iter_questions()
+
     @property
     def concrete(self):
         answer = self.answer
         if answer in ("", None):
             return {}
-        return self.cases[answer].concrete
+        return self.get_case(answer).concrete
 
 
 class QuestionVisitor(ABC):
@@ -439,7 +505,7 @@ class QuestionVisitor(ABC):
         if answer in ("", None):
             return {}
         #
-        return block.cases[answer].accept(self)
+        return block.get_case(answer).accept(self)
 
     def on_empty_entry(self, answer, question):
         pass
@@ -474,6 +540,11 @@ def block_error(block_name, errors):
     return txt
 
 
+def format_answer_errors(errors):
+    """Format the errors of undefined answers, {block: {question: error}}"""
+    return "\n".join(block_error(block, berrors) for block, berrors in errors.items())
+
+
 class ColtErrorAnswerNotDefined(SystemExit):
     """Error if answer is not defined"""
 
@@ -500,14 +571,20 @@ class AnswerVisitor(QuestionVisitor):
         ColtErrorAnswerNotDefined
             in case an answer is not defined
         """
+        answer, errors = self.get_answers_and_errors(qform, check=check)
+        if errors is not None:
+            raise ColtErrorAnswerNotDefined(format_answer_errors(errors))
+        return answer
+
+    def get_answers_and_errors(self, qform, check=True):
+        """Visit the qform and return the answers together with the errors,
+        a dict of {block: {question: error}} or None, without raising"""
         self.error = {}
         self.check = check
         answer = qform.form.accept(self)
-        if check is True:
-            if len(self.error) != 0:
-                raise ColtErrorAnswerNotDefined(self._create_exception(self.error))
+        errors = self.error if len(self.error) != 0 else None
         self.error = None
-        return answer
+        return answer, errors
 
     def visit_question_block(self, block):
         """Visit the question block and store all results in a Mapping"""
@@ -521,15 +598,15 @@ class AnswerVisitor(QuestionVisitor):
                     error[question.label] = "NotSet"
             except ValueError as e:
                 error[question.label] = e
-        out = AnswersBlock(results)
         #
         if self.check is True:
             if len(error) != 0:
                 self.error[block.name] = error
         # update blocks
-        out.update({name: block.accept(self) for name, block in block.blocks.items()})
+        for name, subblock in block.blocks.items():
+            results[name] = subblock.accept(self)
         #
-        return out
+        return AnswersBlock(results)
 
     def visit_subquestion_block(self, block):
         """visit subquestion blocks"""
@@ -541,7 +618,7 @@ class AnswerVisitor(QuestionVisitor):
         if answer is NOT_DEFINED:
             return SubquestionsAnswer(block.label, None, {})
         #
-        return SubquestionsAnswer(block.label, answer, block.cases[answer].accept(self))
+        return SubquestionsAnswer(block.label, answer, block.get_case(answer).accept(self))
 
     def visit_concrete_question_select(self, question):
         return question.get_answer()
@@ -555,10 +632,6 @@ class AnswerVisitor(QuestionVisitor):
     def visit_literal_block(self, block):
         return block.get_answer()
 
-    @staticmethod
-    def _create_exception(errors):
-        return "\n".join(block_error(block, berrors) for block, berrors in errors.items())
-
 
 class QuestionGeneratorVisitor(QuestionASTVisitor):
     """QuestionASTVisitor, to fill a qform"""
@@ -591,12 +664,12 @@ class QuestionGeneratorVisitor(QuestionASTVisitor):
         # current block container
         self.blocks = None
 
-    def visit_question_ast_generator(self, qgen, qform=None):
-        """When visiting an ast generator"""
+    def visit_question_ast_generator(self, qgen, qform=None, question_id=''):
+        """When visiting an ast generator, `question_id` is the name of the main block"""
         # save qform in self.qform
         self.qform = qform
         # set block_name and block_id
-        self.question_id = ''
+        self.question_id = question_id
         # set concrete and blocks to None
         self.concrete = None
         self.blocks = None
@@ -703,53 +776,125 @@ class ErrorSettingAnswerFromDict(SystemExit):
         super().__init__(f"ErrorSettingAnswerFromDict:\n{msg}")
 
 
+def _json_default(obj):
+    """Convert objects json cannot handle by itself,
+    numpy arrays and scalars are converted using `tolist`"""
+    tolist = getattr(obj, 'tolist', None)
+    if tolist is not None:
+        return tolist()
+    if isinstance(obj, UserString):
+        return obj.data
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class WriteJsonVisitor(QuestionVisitor):
-    """Visitor to write the answers to a string"""
+    """Visitor to write the answers as json,
+    the output is written incrementally to a file object"""
 
-    __slots__ = ()
+    __slots__ = ('_fhandle', '_indent', '_level')
 
-    def visit_qform(self, qform, **kwargs):
-        data = qform.form.accept(self)
-        return json.dumps(data, indent=4)
+    def __init__(self):
+        self._fhandle = None
+        self._indent = None
+        self._level = 0
+
+    def visit_qform(self, qform, *, fhandle=None, indent=4):
+        """Write the answers of the qform as json
+
+        Parameters
+        ----------
+        fhandle: file object, optional
+            if given, the json is written to it, else it is returned as a string
+
+        indent: int, optional
+            indentation of the json objects, if None everything is written
+            in a single line
+        """
+        if fhandle is None:
+            output = StringIO()
+        else:
+            output = fhandle
+        self._fhandle = output
+        self._indent = indent
+        self._level = 0
+        try:
+            qform.form.accept(self)
+        finally:
+            self._fhandle = None
+        if fhandle is None:
+            return output.getvalue()
+        return None
 
     def visit_question_block(self, block):
-        # first all normal questions
-        dct = {}
-        for name, question in block.concrete.items():
-            res = question.accept(self)
-            if res is not None:
-                dct[res] = res
-        #
-        for name, subblock in block.blocks.items():
-            dct[name] = subblock.accept(self)
-        return dct
+        self._write_object(self._block_items(block))
 
     def visit_concrete_question_select(self, question):
-        return question.get_answer_as_string()
+        return question.get_answer()
 
     def visit_concrete_question_hidden(self, question):
         pass
 
     def visit_concrete_question_input(self, question):
-        return question.get_answer_as_string()
+        return question.get_answer()
 
     def visit_literal_block(self, block):
-        answer = block.answer
-        if answer.is_none is True:
-            return
-        return answer
+        return block.get_answer()
 
     def visit_subquestion_block(self, block):
         """visit subquestion blocks"""
-        answer = block.main_question.answer
-        dct = {'__answer__': answer}
-        if answer is None:
-            return {}
-        subblock = block.cases.get(answer)
+        answer = block.main_question.get_answer()
+        subblock = None
+        if answer not in (None, NOT_DEFINED):
+            if answer in block.cases:
+                subblock = block.get_case(answer)
         if subblock is None:
-            return {}
-        dct[answer] = subblock.accept(self)
-        return dct
+            self._write_object(())
+            return
+        self._write_object((('__answer__', answer), (answer, subblock)))
+
+    def _block_items(self, block):
+        """iterate over all set answers and subblocks of a block"""
+        # first all normal questions, subquestions are written with the blocks
+        for name, question in block.concrete.items():
+            if name in block.blocks:
+                continue
+            res = question.accept(self)
+            if res is not None and res is not NOT_DEFINED:
+                yield name, res
+        #
+        yield from block.blocks.items()
+
+    def _write_object(self, items):
+        """Write a json object, values that are blocks are written recursively"""
+        write = self._fhandle.write
+        if self._indent is None:
+            item_sep = ', '
+        else:
+            item_sep = ','
+        #
+        self._level += 1
+        is_empty = True
+        write('{')
+        for key, value in items:
+            if is_empty is False:
+                write(item_sep)
+            is_empty = False
+            write(self._newline())
+            write(json.dumps(key))
+            write(': ')
+            if isinstance(value, Component):
+                value.accept(self)
+            else:
+                write(json.dumps(value, default=_json_default))
+        self._level -= 1
+        if is_empty is False:
+            write(self._newline())
+        write('}')
+
+    def _newline(self):
+        if self._indent is None:
+            return ''
+        return '\n' + ' ' * (self._indent * self._level)
 
 
 class WriteConfigVisitor(QuestionVisitor):
@@ -804,11 +949,13 @@ class WriteConfigVisitor(QuestionVisitor):
 class QuestionForm(Mapping, Component):
     """Main interface to the question forms"""
     #
-    __slots__ = ('blocks', 'literals', 'unset', 'form')
+    __slots__ = ('blocks', 'literals', 'unset', 'form', '_state')
     # visitor to generate answers
     answer_visitor = AnswerVisitor()
     # visitor to write answers to file
     write_visitor = WriteConfigVisitor()
+    # visitor to write answers as json
+    json_visitor = WriteJsonVisitor()
     # visitor to generate question forms
     question_generator_visitor = QuestionGeneratorVisitor()
 
@@ -819,18 +966,46 @@ class QuestionForm(Mapping, Component):
         self.literals = {}
         # not set variables
         self.unset = {}
+        # saved answer state, see `save_state`
+        self._state = None
+        # names of the case blocks whose questions are not loaded yet, see `generate_case`
+        self._lazy_cases = set()
+        # {blockname: fields} presets of blocks in lazy cases, applied once they are loaded
+        self._lazy_presets = {}
         # generate Question Forms
         self.form = self._generate_forms(questions)
         #
-        self.set_answers_and_presets(config, presets)
+        with profile('set_answers_and_presets', 'qform'):
+            self.set_answers_and_presets(config, presets)
 
     def _generate_forms(self, questions):
-        questions = QuestionASTGenerator(questions)
-        return self.question_generator_visitor.visit(questions, qform=self)
+        with profile('QuestionASTGenerator', 'qform'):
+            questions = QuestionASTGenerator(questions)
+        with profile('QuestionGeneratorVisitor', 'qform'):
+            return self.question_generator_visitor.visit(questions, qform=self)
 
     def accept(self, visitor, **kwargs):
         return visitor.visit_qform(self, **kwargs)
 
+    def generate_case(self, block, questions):
+        """Generate the questions of the case `block` of a subquestion block,
+        the new block replaces `block` in the form, presets given for it are applied
+
+        Returns
+        -------
+        QuestionBlock
+            the block containing the questions
+        """
+        questions = QuestionASTGenerator(questions)
+        case = self.question_generator_visitor.visit(questions, qform=self, question_id=block.name)
+        if case.comment is None:
+            case.comment = block.comment
+        self._lazy_cases.discard(block.name)
+        for blockname in list(self._lazy_presets):
+            if _in_block(blockname, block.name):
+                self._set_block_presets(blockname, self._lazy_presets.pop(blockname))
+        return case
+
     @property
     def is_all_set(self):
         """check if all questions are answered"""
@@ -875,10 +1050,45 @@ class QuestionForm(Mapping, Component):
         """
         return self.answer_visitor.visit(self, check=check)
 
+    def get_answers_and_errors(self):
+        """Get the answers from the forms without raising in case answers are not set
+
+        Returns
+        -------
+        tuple(AnswersBlock, dict)
+            the answers, and the errors as {block: {question: error}}, or None
+        """
+        return self.answer_visitor.get_answers_and_errors(self)
+
     def get_blocks(self):
         """return blocks"""
         return self.form.get_blocks()
 
+    def save_state(self, block=None):
+        """Save the current answers, so they can be restored using `reset`
+
+        Parameters
+        ----------
+        block: QuestionBlock, optional
+            if given, only update the saved state of the questions in that block
+        """
+        if block is None:
+            self._state = {question: question.get_state()
+                           for question in self.form.iter_questions()}
+            return
+        if self._state is None:
+            raise ValueError("No state saved, cannot update it")
+        self._state.update((question, question.get_state())
+                           for question in block.iter_questions())
+
+    def reset(self):
+        """Reset all answers to the state saved by `save_state`,
+        choices and presets are not changed"""
+        if self._state is None:
+            raise ValueError("No state saved, cannot reset the answers")
+        for question, state in self._state.items():
+            question.set_state(state)
+
     def write_config(self, filename):
         """ get a linear config and write it to the file"""
         if isinstance(filename, StringIO):
@@ -886,6 +1096,24 @@ class QuestionForm(Mapping, Component):
         with open(filename, 'w') as fhandle:
             fhandle.write(self.write_visitor.visit(self))
 
+    def write_json(self, fhandle, *, indent=4):
+        """Write the answers as json to a file object or filename
+
+        Parameters
+        ----------
+        fhandle: str or file object
+            name of the output file, or file object the json is written to
+
+        indent: int, optional
+            indentation of the json objects, if None the answers are written
+            in a single line
+        """
+        if isinstance(fhandle, str):
+            with open(fhandle, 'w') as output:
+                self.json_visitor.visit(self, fhandle=output, indent=indent)
+            return
+        self.json_visitor.visit(self, fhandle=fhandle, indent=indent)
+
     def set_answers_from_file(self, filename, raise_error=True):
         error = self._set_answers_from_file(filename)
         if raise_error is True and error.is_none() is False:
@@ -912,19 +1140,26 @@ class QuestionForm(Mapping, Component):
         presets = PresetGenerator(presets).tree
         #
         for blockname, fields in presets.items():
-            if blockname not in self.blocks:
-                print(f"Unknown block {blockname} in presets, continue")
+            if any(_in_block(blockname, case) for case in self._lazy_cases):
+                # set once the questions of the case are loaded
+                self._lazy_presets.setdefault(blockname, {}).update(fields)
                 continue
-            block = self.blocks[blockname]
-            for key, preset in fields.items():
-                if key not in block:
-                    print(f"Unknown key {key} in {blockname} in presets, continue")
-                    continue
-                try:
-                    block[key].preset(preset.default, preset.choices)
-                except ValidatorErrorNotChoicesSubset:
-                    print((f"Could not update choices in '{blockname}' entry '{key}' as choices ",
-                           "not subset of previous choices, continue"))
+            self._set_block_presets(blockname, fields)
+
+    def _set_block_presets(self, blockname, fields):
+        if blockname not in self.blocks:
+            print(f"Unknown block {blockname} in presets, continue")
+            return
+        block = self.blocks[blockname]
+        for key, preset in fields.items():
+            if key not in block:
+                print(f"Unknown key {key} in {blockname} in presets, continue")
+                continue
+            try:
+                block[key].preset(preset.default, preset.choices)
+            except ValidatorErrorNotChoicesSubset:
+                print((f"Could not update choices in '{blockname}' entry '{key}' as choices ",
+                       "not subset of previous choices, continue"))
 
     def __iter__(self):
         return iter(self.get_blocks())
@@ -1063,3 +1298,28 @@ class ColtInputError:
     def append(self, block_error):
         if block_error.is_none() is False:
             self._errors.append(block_error)
+
+
+def write_json_lines(qforms, fhandle):
+    """Write the answers of many question forms as newline delimited json,
+    one form per line
+
+    Parameters
+    ----------
+    qforms: iterable of QuestionForm
+        question forms to be written, can be a generator
+
+    fhandle: str or file object
+        name of the output file, or file object the lines are written to
+    """
+    if isinstance(fhandle, str):
+        with open(fhandle, 'w') as output:
+            return write_json_lines(qforms, output)
+    #
+    visitor = WriteJsonVisitor()
+    nforms = 0
+    for qform in qforms:
+        visitor.visit(qform, fhandle=fhandle, indent=None)
+        fhandle.write('\n')
+        nforms += 1
+    return nforms
@@ -1,4 +1,5 @@
 """Definitions of all Question Classes"""
+import sys
 from abc import abstractmethod, ABC
 from collections import UserDict
 #
@@ -8,6 +9,13 @@ from .validator import NOT_DEFINED
 from .slottedcls import slottedcls
 
 
+def _intern(value):
+    """intern strings, any other value is returned unchanged"""
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
 class Component(ABC):
     """Basic Visitor Component"""
 
@@ -53,13 +61,15 @@ class Question(Component):
 
     def __init__(self, question="", typ="str", default=NOT_DEFINED,
                  choices=None, comment=None, is_optional=False, alias=None):
-        self.question = question
-        self.typ = typ
-        self.default = default
-        self.choices = choices
-        self.comment = comment
+        # the metadata is shared by all concrete questions, equal strings are
+        # interned to store them only once in large forms
+        self.question = _intern(question)
+        self.typ = _intern(typ)
+        self.default = _intern(default)
+        self.choices = _intern(choices)
+        self.comment = _intern(comment)
         self.is_optional = is_optional
-        self.alias = alias
+        self.alias = _intern(alias)
 
     def __eq__(self, other):
         if not isinstance(other, Question):
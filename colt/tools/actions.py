@@ -1,4 +1,10 @@
+from abc import ABCMeta
+#
+from ..colt import no_extend_user_input
+from ..parser import CommandlineParserVisitor, HelpFormatter
 from ..plugins import Plugin
+from ..qform import QuestionForm
+from ..questions import QuestionASTGenerator
 
 
 __all__ = ['create_action']
@@ -26,14 +32,31 @@ def _create_factory(name, user_input, options_name, general_action, description)
         questions.generate_cases(options_name, {action.name: action.colt_user_input
                                                 for action in cls.plugins.values()})
 
+    @classmethod
+    def _create_commandline_parser(cls, description=None, presets=None):
+        """The questions of an action are only created once it is selected"""
+        questions = QuestionASTGenerator(cls._user_input, comment=cls._colt_description)
+        questions.generate_cases(options_name, {
+            name: QuestionASTGenerator("", comment=action._colt_description)
+            for name, action in cls.plugins.items()})
+        qform = QuestionForm(questions)
+        cases = qform.form.blocks[options_name]
+        for name, action in cls.plugins.items():
+            cases.set_case_loader(name, _questions_loader(action))
+        # presets of the actions are applied once their questions are loaded
+        if presets is not None:
+            qform.set_presets(presets)
+        return CommandlineParserVisitor(HelpFormatter(settings=description)).visit(qform)
+
     @classmethod
     def from_config(cls, config):
         cls.general_action(config)
         config = config[options_name]
-        for action in cls.plugins.values():
-            if action.name == config.value:
-                return action.from_config(config)
-        raise Exception(f"Action '{config[config.value]}' unknown")
+        try:
+            action = cls.plugins.resolve(config.value)
+        except KeyError:
+            raise Exception(f"Action '{config.value}' unknown") from None
+        return action.from_config(config)
 
     return type(name + 'Factory', (Plugin, ), {
         'name': name,
@@ -43,11 +66,17 @@ def _create_factory(name, user_input, options_name, general_action, description)
         'options_name': options_name,
         'general_action': general_action,
         '_extend_user_input': _extend_user_input,
+        '_create_commandline_parser': _create_commandline_parser,
         '_user_input': user_input,
         'from_config': from_config,
     })
 
 
+def _questions_loader(action):
+    """function returning the questions of an action"""
+    return lambda: action.colt_user_input
+
+
 def _create_base_action(name, Factory):
 
     @classmethod
@@ -66,6 +95,53 @@ def _create_base_action(name, Factory):
         })
 
 
+class ActionDescriptor:
+    """Registered action, the action class is only created once it is used
+
+    The descriptor provides the questions of the action, any other attribute,
+    e.g. `from_config`, creates the action class, that replaces the descriptor
+    in the plugins of the factory.
+    """
+
+    __slots__ = ('name', 'function', '_user_input', '_colt_description', '_lazy_imports',
+                 '_base', '_action')
+
+    def __init__(self, base, name, function, user_input, description=None, lazy_imports=None):
+        self._base = base
+        self.name = name
+        self.function = function
+        self._user_input = user_input
+        self._colt_description = description
+        self._lazy_imports = lazy_imports
+        self._action = None
+
+    @property
+    def colt_user_input(self):
+        return QuestionASTGenerator(self._user_input, comment=self._colt_description)
+
+    def _colt_fingerprint(self):
+        # same fingerprint as the action class, see `ColtMeta._colt_fingerprint`
+        return (self._user_input, self._colt_description, no_extend_user_input)
+
+    def load(self):
+        """Create and return the action class"""
+        if self._action is None:
+            data = {'_user_input': self._user_input, 'run': staticmethod(self.function),
+                    'name': self.name}
+            if self._colt_description is not None:
+                data['_colt_description'] = self._colt_description
+            if self._lazy_imports is not None:
+                data['_lazy_imports'] = self._lazy_imports
+            self._action = type(self.name, (self._base, ), data)
+        return self._action
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        return f"ActionDescriptor({self.name})"
+
+
 class ActionDecorator:
     """Decorator to create actions (from config/commandline callable functions)"""
 
@@ -96,13 +172,9 @@ class ActionDecorator:
             nonlocal name
             if name is None:
                 name = func.__name__
-            data = {'_user_input': user_input, 'run': staticmethod(func), 'name': name}
-            if description is not None:
-                data['_colt_description'] = description
-            if lazy_imports is not None:
-                data['_lazy_imports'] = lazy_imports
-            # just create the type for registration
-            type(name, (self.Action, ), data)
+            # only register the action, the class is created on use
+            self._Factory.add_plugin(name, ActionDescriptor(self.Action, name, func, user_input,
+                                                            description, lazy_imports))
             return func
         return _action_creator
 
@@ -121,41 +193,40 @@ class Marker:
         self.function = function
         return self
 
-class _ColtActionMaker(ABCMeta):
+class ColtActionMaker(ABCMeta):
 
-    def __prepare__(cls, metacls, *args, **kwargs):
+    @classmethod
+    def __prepare__(mcs, name, bases, **kwargs):
         return {'register': Marker}
 
     def __new__(cls, name, bases, clsdict):
         """Modify clsdict before the new method of the metaclass is called"""
         markers = {}
-        for name, value in clsdict.items():
+        for key, value in clsdict.items():
             if isinstance(value, Marker):
-                markers[name] = (value.description, value.user_input)
-        for name in markers:
-            clsdict[name] = clsdict[name].function
+                markers[key] = (value.description, value.user_input)
+        for key in markers:
+            clsdict[key] = clsdict[key].function
 
         action_name = clsdict.get('_colt_action_name', 'commandline')
         if '__init__' in clsdict:
             __init__ = clsdict['__init__']
-            def _init(self, *args, **kwargs):
-                action = create_action('value')
-                for name, (description, user_input) in markers.items():
-                    action.register(description, user_input)(getattr(self, name))
-                setattr(self, action_name, action)
-                __init__(self, *args, **kwargs)
         else:
-            def _init(self, *args, **kwargs):
-                action = create_action('value')
-                for name, (description, user_input) in markers.items():
-                    action.register(description, user_input)(getattr(self, name))
-                setattr(self, action_name, action)
-                super().__init__(*args, **kwargs)
+            def __init__(self, *args, **kwargs):
+                super(action_cls, self).__init__(*args, **kwargs)
+
+        def _init(self, *args, **kwargs):
+            action = create_action('value')
+            for key, (description, user_input) in markers.items():
+                action.register(description, user_input)(getattr(self, key))
+            setattr(self, action_name, action)
+            __init__(self, *args, **kwargs)
 
         #
         clsdict['__init__'] = _init
         #
-        return ABCMeta.__new__(cls, name, bases, clsdict)
+        action_cls = ABCMeta.__new__(cls, name, bases, clsdict)
+        return action_cls
 
 
 class ColtAction(metaclass=ColtActionMaker):
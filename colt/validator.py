@@ -1,11 +1,18 @@
 """Basic Validator to convert user input into python objects
 while automatically checking the type and doing error handling"""
 import os
+import sys
 import ast
+from copy import deepcopy
 from collections.abc import KeysView
 from collections import namedtuple
+from weakref import WeakValueDictionary
 #
-import numpy as np
+from .lazyimport import LazyImport
+
+
+# numpy is only imported once it is used
+np = LazyImport('numpy', local_name='np')
 
 
 __all__ = ["NOT_DEFINED", "Validator", "ValidatorErrorNotInChoices"]
@@ -44,13 +51,28 @@ NO_CHOICE = NoChoice()
 
 
 class Choices:
-    """Store possible choices"""
+    """Store possible choices, use `Choices.shared` to reuse equal instances"""
 
-    __slots__ = ('choices',)
+    __slots__ = ('choices', '__weakref__')
 
     def __init__(self, choices):
         self.choices = choices
 
+    @classmethod
+    def shared(cls, choices):
+        """return a `Choices` instance that is shared by all equal choices,
+        the types are part of the key to distinguish 1 and 1.0"""
+        choices = tuple(sys.intern(choice) if type(choice) is str else choice
+                        for choice in choices)
+        try:
+            key = tuple((type(choice), choice) for choice in choices)
+            shared = _SHARED_CHOICES.get(key)
+        except TypeError:
+            return cls(choices)
+        if shared is None:
+            shared = _SHARED_CHOICES[key] = cls(choices)
+        return shared
+
     def as_str(self):
         """return choices as a string"""
         txt = ", ".join(str(choice) for choice in self.choices)
@@ -88,6 +110,10 @@ class Choices:
         return all(choice in rhs.choices for choice in self.choices)
 
 
+# flyweights of the choices, they are removed once no validator uses them
+_SHARED_CHOICES = WeakValueDictionary()
+
+
 class RangeExpression:
     """Simple class to handle mathematical ranges"""
 
@@ -327,10 +353,27 @@ class NotDefined:
     def __str__(self):
         return "<NOT_DEFINED>"
 
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
 
 NOT_DEFINED = NotDefined()
 
 
+# values that do not need to be copied
+_IMMUTABLE_TYPES = frozenset((int, float, complex, bool, str, bytes, type(None), NotDefined))
+
+
+def _copy_value(value):
+    """deep copy of an answer value, immutable values are returned as they are"""
+    if type(value) in _IMMUTABLE_TYPES:
+        return value
+    return deepcopy(value)
+
+
 class ValidatorErrorNotInChoices(Exception):
     """Exception in case value is not in choices"""
 
@@ -342,7 +385,7 @@ class ValidatorErrorNotChoicesSubset(Exception):
 class BaseValidator:
     """Base class to validator"""
 
-    __slots__ = ('_choices', '_default', '_value', '_string', '_parse')
+    __slots__ = ('_choices', '_default', '_value', '_string', '_parse', '__weakref__')
     # overwrite this method
 
     def __init__(self, parse_function, default=NOT_DEFINED, choices=None):
@@ -412,6 +455,16 @@ class BaseValidator:
         """Return self._value if its set or not!"""
         return self._value
 
+    def get_state(self):
+        """Return a copy of the current answer state, see `set_state`"""
+        return (_copy_value(self._value), self._string)
+
+    def set_state(self, state):
+        """Restore an answer state returned by `get_state`, the value is copied,
+        so the state can be restored several times"""
+        value, self._string = state
+        self._value = _copy_value(value)
+
     def set(self, value):
         """set the value"""
         self._value = self._get_value(value)
@@ -428,19 +481,21 @@ class BaseValidator:
         """set choices"""
         if choices is None:
             return NO_CHOICE
+        if isinstance(choices, Choices):
+            return choices
         return self.set_choices(choices)
 
     def set_choices(self, choices):
         """set choices"""
         if isinstance(choices, KeysView):
-            return Choices([self._parse(choice) for choice in choices])
+            return Choices.shared(self._parse(choice) for choice in choices)
         try:
             choices = [self._parse(choice) for choice in list_parser(choices)]
         except ValueError:
             choices = None
         if choices is None:
             raise ValueError(f"Choices '{choices}' cannot be parsed")
-        return Choices(choices)
+        return Choices.shared(choices)
 
     def _get_value(self, string):
         """Sets the value"""
@@ -458,7 +513,7 @@ class RangeValidator(BaseValidator):
     def set_choices(self, choices):
         """set choices"""
         if isinstance(choices, KeysView):
-            return Choices([self._parse(choice) for choice in choices])
+            return Choices.shared(self._parse(choice) for choice in choices)
         #
         try:
             return RangeExpression(choices)
@@ -472,7 +527,7 @@ class RangeValidator(BaseValidator):
         #
         if choices is None:
             raise ValueError(f"Choices '{choices}' cannot be parsed")
-        return Choices(choices)
+        return Choices.shared(choices)
 
 
 class DelayedDefaultValidator(BaseValidator):
@@ -639,6 +694,10 @@ class Validator:
 
     """ Validator Factory class """
 
+    # the element validators of lists hold no answer, they are shared between
+    # all list validators of the same type and choices, as long as any uses them
+    _element_validators = WeakValueDictionary()
+
     def __new__(cls, typ, default=NOT_DEFINED, choices=None):
         return cls._get_all_validators(typ, default, choices)
 
@@ -704,6 +763,18 @@ class Validator:
         except ValueError:
             raise ValueError(f"Do not understand type '{typ}'") from None
 
+    @classmethod
+    def _get_element_validator(cls, clstyp, func, choices):
+        try:
+            key = (clstyp, func, choices)
+            validator = cls._element_validators.get(key)
+        except TypeError:
+            return clstyp(func, default=NOT_DEFINED, choices=choices)
+        if validator is None:
+            validator = cls._element_validators[key] = clstyp(func, default=NOT_DEFINED,
+                                                              choices=choices)
+        return validator
+
     @classmethod
     def _get_all_validators(cls, typ, default, choices):
         # list(typ) or list(typ, 10) are special validators
@@ -717,6 +788,6 @@ class Validator:
         #
         clstyp, func = ValidatorSelector(typ)
         if list_info.is_list is True:
-            validator = clstyp(func, default=NOT_DEFINED, choices=choices)
+            validator = cls._get_element_validator(clstyp, func, choices)
             return ListValidator(validator, list_info.nele, default=default)
         return clstyp(func, default=default, choices=choices)
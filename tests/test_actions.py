@@ -0,0 +1,78 @@
+from colt.parser import SysIterator
+from colt.tools.actions import ActionDescriptor, ColtAction, create_action
+
+
+def make_action():
+    action = create_action('tool')
+
+    @action.register("add two numbers", "a = :: int\nb = 1 :: int")
+    def add(a, b):
+        return a + b
+
+    @action.register("multiply two numbers", "a = :: int\nb = 2 :: int")
+    def mul(a, b):
+        return a * b
+
+    return action
+
+
+def run(action, argv):
+    Factory = action._Factory
+    answers = Factory._get_commandline_parser().get_answers(args=SysIterator(argv))
+    return Factory._from_config(answers)
+
+
+def test_actions_are_created_on_use():
+    action = make_action()
+    plugins = action._Factory.plugins
+    assert all(isinstance(plugin, ActionDescriptor) for plugin in plugins.values())
+    assert run(action, ['mul', '3']) == 6
+    # only the selected action got a class
+    assert not isinstance(plugins['mul'], ActionDescriptor)
+    assert plugins['mul'].name == 'mul'
+    assert isinstance(plugins['add'], ActionDescriptor)
+    assert run(action, ['add', '3', '--b', '4']) == 7
+
+
+def test_action_questions_are_created_on_use(monkeypatch):
+    loaded = []
+    user_input = ActionDescriptor.colt_user_input
+
+    def _colt_user_input(self):
+        loaded.append(self.name)
+        return user_input.fget(self)
+
+    monkeypatch.setattr(ActionDescriptor, 'colt_user_input', property(_colt_user_input))
+    action = make_action()
+    parser = action._Factory._get_commandline_parser()
+    assert [case.comment for case in parser.children[0].iter_cases()] == [
+        "add two numbers", "multiply two numbers"]
+    assert run(action, ['mul', '3', '--b', '3']) == 9
+    assert loaded == ['mul']
+    # the parser is reused
+    assert run(action, ['mul', '3']) == 6
+    assert loaded == ['mul']
+
+
+def test_action_presets_are_applied_on_use(capsys):
+    Factory = make_action()._Factory
+    parser = Factory._get_commandline_parser(presets="[options(mul)]\nb = 5")
+    answers = parser.get_answers(args=SysIterator(['mul', '3']))
+    assert Factory._from_config(answers) == 15
+    assert capsys.readouterr().out == ''
+
+
+def test_colt_action():
+
+    class Tools(ColtAction):
+
+        def __init__(self, offset):
+            self.offset = offset
+
+        @register("shift a number", "a = :: int")  # noqa: F821
+        def shift(self, a):
+            return a + self.offset
+
+    tools = Tools(10)
+    assert tools.offset == 10
+    assert run(tools.commandline, ['shift', '5']) == 15
@@ -0,0 +1,108 @@
+import pytest
+#
+import gc
+import json
+import pickle
+#
+from colt.answers import AnswersBlock, AnswersSchema, SubquestionsAnswer
+from colt.qform import QuestionForm
+
+
+@pytest.fixture
+def questions():
+    return """
+      value = 2 :: int
+      [qm]
+      nqm = 100 :: int
+      [examplecase(yes)]
+      a = 10 :: int
+      [examplecase(no)]
+      a = 666 :: int
+      [examplecase(no)::further]
+      b = 1 :: int
+    """
+
+
+def test_answers_share_schema(questions):
+    answers1 = QuestionForm(questions, config={"": {"examplecase": "yes"}}).get_answers()
+    answers2 = QuestionForm(questions, config={"": {"examplecase": "yes"}}).get_answers()
+    assert answers1.schema is answers2.schema
+    assert answers1['qm'].schema is answers2['qm'].schema
+
+
+def test_unused_schemas_are_released():
+    keys = ('unused_schema_a', 'unused_schema_b')
+    block = AnswersBlock(dict.fromkeys(keys))
+    assert AnswersSchema.from_keys(keys) is block.schema
+    del block
+    gc.collect()
+    assert keys not in AnswersSchema._schemas
+
+
+def test_answers_block_mapping():
+    block = AnswersBlock({'a': 1, 'b': 2})
+    block.update({'b': 3, 'c': 4})
+    assert list(block) == ['a', 'b', 'c']
+    assert block == {'a': 1, 'b': 3, 'c': 4}
+    assert block.get('d') is None
+    assert 'c' in block
+    with pytest.raises(KeyError):
+        block['d']
+
+
+def test_answers_get_path(questions):
+    answers = QuestionForm(questions, config={'': {'examplecase': 'no'}}).get_answers()
+    assert answers.get_path('qm::nqm') == 100
+    assert answers.get_path('examplecase(no)::a') == 666
+    assert answers.get_path('examplecase(no)::further::b') == 1
+    assert isinstance(answers.get_path('examplecase'), SubquestionsAnswer)
+    with pytest.raises(KeyError):
+        answers.get_path('examplecase(yes)::a')
+    with pytest.raises(KeyError):
+        answers.get_path('qm::unknown')
+
+
+def test_answers_pickle(questions):
+    answers = QuestionForm(questions, config={"": {"examplecase": "yes"}}).get_answers()
+    loaded = pickle.loads(pickle.dumps(answers))
+    assert loaded.to_dict() == answers.to_dict()
+    assert loaded.schema is answers.schema
+
+
+def test_answers_to_dict_lazy(questions):
+    answers = QuestionForm(questions, config={"": {"examplecase": "yes"}}).get_answers()
+    dct = answers.to_dict(lazy=True)
+    assert isinstance(dct._data['qm'], AnswersBlock)
+    assert dct['qm'] == {'nqm': 100}
+    assert type(dct._data['qm']) is not AnswersBlock
+    assert dct == answers.to_dict()
+    # C level consumers see the converted blocks as well
+    dct = answers.to_dict(lazy=True)
+    assert {**dct} == dict(dct) == answers.to_dict()
+    assert (json.dumps(answers.to_dict(lazy=True), default=dict)
+            == json.dumps(answers.to_dict(), default=dict))
+
+
+def test_answers_mapping_proxy(questions):
+    answers = QuestionForm(questions, config={"": {"examplecase": "yes"}}).get_answers()
+    proxy = answers.as_mapping_proxy()
+    assert proxy['qm'] is answers['qm']
+    with pytest.raises(TypeError):
+        proxy['value'] = 3
+
+
+def test_answers_diff(questions):
+    old = QuestionForm(questions, config={"": {"examplecase": "no"}}).get_answers()
+    new = QuestionForm(questions, config={"": {"examplecase": "no", "value": "3"},
+                                          "examplecase(no)::further": {"b": "2"}}).get_answers()
+    diff = old.diff(new)
+    assert diff.changed == {'value': (2, 3), 'examplecase(no)::further::b': (1, 2)}
+    assert diff.added == {}
+    assert diff.removed == {}
+    #
+    new = QuestionForm(questions, config={"": {"examplecase": "yes"}}).get_answers()
+    diff = old.diff(new)
+    assert diff.changed == {'examplecase': ('no', 'yes')}
+    assert list(diff.removed) == ['examplecase(no)']
+    assert list(diff.added) == ['examplecase(yes)']
+    assert not old.diff(old)
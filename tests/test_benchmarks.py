@@ -0,0 +1,13 @@
+from benchmarks.suite import BENCHMARKS, find_regressions, run_benchmarks
+
+
+def test_benchmarks_run():
+    results = run_benchmarks((10,), min_time=0.0, repeat=1, verbose=False)
+    assert set(results) == {f"{name}[10]" for name in BENCHMARKS}
+    assert all(value > 0 for value in results.values())
+
+
+def test_benchmarks_regressions():
+    baseline = {'a[10]': 1.0, 'b[10]': 1.0}
+    results = {'a[10]': 1.1, 'b[10]': 2.0, 'c[10]': 5.0}
+    assert find_regressions(results, baseline, 1.25) == {'b[10]': 2.0}
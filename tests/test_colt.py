@@ -68,3 +68,35 @@ def test_colt_question_inheritance(base):
     assert cls.natoms == 10
     assert cls.factor == 1.0
     assert cls.screening is True
+
+
+def test_colt_from_commandline_cached_parser(base):
+    parser = base._get_commandline_parser()
+    assert base._get_commandline_parser() is parser
+    sys.argv = ['name', '10', '231', '--factor', '2.8', '--screening']
+    cls = base.from_commandline()
+    assert cls.factor == 2.8
+    assert cls.screening is False
+    # answers of the previous call are reset
+    sys.argv = ['name', '231', '10']
+    cls = base.from_commandline()
+    assert cls.nstates == 231
+    assert cls.factor == 1.0
+    assert cls.screening is True
+    assert base._get_commandline_parser() is parser
+
+
+def test_colt_from_commandline_cached_parser_copies_values():
+
+    class Lists(Colt):
+        _user_input = "lst = 1 2 :: ilist"
+
+        @classmethod
+        def from_config(cls, answers):
+            return answers['lst']
+
+    sys.argv = ['name']
+    lst = Lists.from_commandline()
+    assert lst == [1, 2]
+    lst.append(99)
+    assert Lists.from_commandline() == [1, 2]
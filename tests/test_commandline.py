@@ -0,0 +1,61 @@
+import pytest
+#
+from colt.commandline import get_config_from_commandline
+
+
+@pytest.fixture
+def questions():
+    return """
+      nstates = :: int
+      factor = 1.0 :: float
+      screening = True :: bool
+      _name = colt :: str
+
+      [method(tddft)]
+      roots = 4 :: int
+      [method(cis)]
+      singlets = 2 :: int
+    """
+
+
+@pytest.mark.parametrize("engine", ["colt", "argparse"])
+def test_commandline_engines(questions, engine):
+    args = ['3', '-factor', '2.0', 'cis', '-singlets', '3']
+    answers = get_config_from_commandline(questions, args=args, engine=engine)
+    assert answers['nstates'] == 3
+    assert answers['factor'] == 2.0
+    assert answers['method'] == 'cis'
+    assert answers['method']['singlets'] == 3
+
+
+@pytest.mark.parametrize("engine", ["colt", "argparse"])
+def test_commandline_engines_bool_value(questions, engine):
+    args = ['3', '-screening', 'False', 'cis']
+    answers = get_config_from_commandline(questions, args=args, engine=engine)
+    assert answers['screening'] is False
+
+
+@pytest.mark.parametrize("engine", ["colt", "argparse"])
+def test_commandline_engines_hidden_question(questions, engine):
+    answers = get_config_from_commandline(questions, args=['3', 'cis'], engine=engine)
+    assert answers['_name'] == 'colt'
+    answers = get_config_from_commandline(questions, args=['3', '-_name', 'argparse', 'cis'],
+                                          engine=engine)
+    assert answers['_name'] == 'argparse'
+
+
+@pytest.mark.parametrize("engine", ["colt", "argparse"])
+@pytest.mark.parametrize("args, code", [
+    (['x', 'cis'], 2),
+    (['3', 'ccsd'], 2),
+    (['3', 'cis', '-h'], 0),
+])
+def test_commandline_engines_exit_code(questions, capsys, engine, args, code):
+    with pytest.raises(SystemExit) as error:
+        get_config_from_commandline(questions, args=args, engine=engine)
+    assert error.value.code == code
+
+
+def test_commandline_unknown_engine(questions):
+    with pytest.raises(ValueError):
+        get_config_from_commandline(questions, args=['3', 'cis'], engine='click')
@@ -0,0 +1,194 @@
+import pytest
+#
+import shutil
+import socket
+import subprocess
+import threading
+#
+from colt import Plugin
+from colt.completion import CompletionServer, completion_script, get_completion_table
+from colt.completion import request_completion
+
+
+@pytest.fixture
+def questions():
+    return """
+      nstates = :: int
+      factor = 1.0 :: float
+      mode = fast :: str :: fast, slow
+      screening = True :: bool
+      geometry = :: existing_file, optional
+
+      [method(tddft)]
+      roots = 4 :: int
+      [method(cis)]
+      singlets = 2 :: int :: 1, 2, 3
+    """
+
+
+@pytest.mark.parametrize("words, expected", [
+    (['3', ''], ('tddft', 'cis')),
+    (['3', 't'], ('tddft',)),
+    (['--mode', ''], ('fast', 'slow')),
+    (['--mo', 's'], ('slow',)),
+    (['3', '--screening', '--sc'], ('--screening',)),
+    (['3', 'cis', '--singlets', ''], ('1', '2', '3')),
+    (['3', 'cis', '--si'], ('--singlets',)),
+    (['3', 'cis', ''], ()),
+])
+def test_complete_words(questions, words, expected):
+    table = get_completion_table(questions)
+    assert table.complete(words).words == expected
+
+
+def test_complete_files(questions):
+    table = get_completion_table(questions)
+    assert table.complete(['--geometry', 'mol']).files == 'f'
+
+
+def test_completion_script_unknown_shell(questions):
+    with pytest.raises(ValueError):
+        completion_script(questions, 'prog', shell='tcsh')
+
+
+@pytest.mark.skipif(shutil.which('bash') is None, reason="bash not available")
+@pytest.mark.parametrize("line", ["prog 3 ", "prog 3 t", "prog --mode ", "prog --sc",
+                                  "prog --mo ", "prog 3 cis --singlets ", "prog 3 cis --sin ",
+                                  "prog 3 cis --s"])
+def test_bash_completion(questions, line):
+    script = completion_script(questions, 'prog', shell='bash')
+    command = (script + f"\nCOMP_LINE={line!r}; COMP_POINT=${{#COMP_LINE}}\n"
+               "_colt_prog\nprintf '%s\\n' \"${COMPREPLY[@]}\"\n")
+    output = subprocess.run(['bash', '-c', command], capture_output=True, text=True, check=True)
+    words = line.split(' ')[1:]
+    expected = get_completion_table(questions).complete(words).words
+    assert tuple(output.stdout.split()) == expected
+
+
+@pytest.mark.parametrize("shell, header, register", [
+    ('bash', "# bash completion for prog", "complete -F _colt_prog prog"),
+    ('zsh', "#compdef prog", "compdef _colt_prog prog"),
+    ('fish', "# fish completion for prog", "complete -c prog -f -a '(_colt_prog)'"),
+])
+def test_completion_script_tables(questions, shell, header, register):
+    script = completion_script(questions, 'prog', shell=shell)
+    assert script.startswith(header)
+    assert script.rstrip().endswith(register)
+    # all options of a parser are listed once, abbreviations are resolved by the script
+    assert "'l0'" in script
+    assert "--screening --geometry" in script
+    assert "'--mo'" not in script and "--scr'" not in script
+    assert "_colt_prog_option" in script
+
+
+@pytest.mark.skipif(shutil.which('zsh') is None, reason="zsh not available")
+def test_zsh_script_syntax(questions, tmp_path):
+    (tmp_path / '_prog').write_text(completion_script(questions, 'prog', shell='zsh'))
+    subprocess.run(['zsh', '-n', str(tmp_path / '_prog')], check=True)
+
+
+@pytest.mark.skipif(shutil.which('fish') is None, reason="fish not available")
+@pytest.mark.parametrize("line", ["prog 3 ", "prog --mo ", "prog 3 cis --sin "])
+def test_fish_completion(questions, line, tmp_path):
+    script = tmp_path / 'prog.fish'
+    script.write_text(completion_script(questions, 'prog', shell='fish'))
+    words = line.split(' ')[1:]
+    command = (f"source {script}; _colt_prog_walk " + " ".join(f"'{word}'" for word in words))
+    output = subprocess.run(['fish', '-c', command], capture_output=True, text=True, check=True)
+    expected = get_completion_table(questions).complete(words).words
+    assert tuple(output.stdout.split()) == expected
+
+
+@pytest.fixture
+def server(questions, tmp_path):
+    server = CompletionServer(str(tmp_path / 'colt.sock'), questions)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_completion_server(server):
+    assert request_completion(server.server_address, ['3', '']).words == ('tddft', 'cis')
+    assert request_completion(server.server_address, ['--geometry', '']).files == 'f'
+
+
+def test_completion_server_stalled_client(server):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stalled:
+        stalled.connect(server.server_address)
+        stalled.sendall(b"3\0")
+        assert request_completion(server.server_address, ['3', '']).words == ('tddft', 'cis')
+
+
+def test_completion_server_stale_socket(questions, tmp_path):
+    path = str(tmp_path / 'colt.sock')
+    # socket file left by a crashed server
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(path)
+    with CompletionServer(path, questions) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        # a running server is not removed
+        with pytest.raises(OSError):
+            CompletionServer(path, questions)
+        assert request_completion(path, ['3', '']).words == ('tddft', 'cis')
+        server.shutdown()
+        thread.join()
+
+
+def _bash_server_command(server):
+    # the static tables know different modes than the server
+    script = completion_script("mode = fast :: str :: fast, medium", 'prog',
+                               socket=server.server_address)
+    return (script + "\nCOMP_LINE='prog --mode '; COMP_POINT=${#COMP_LINE}\n"
+            "_colt_prog\nprintf '%s\\n' \"${COMPREPLY[@]}\"\n")
+
+
+@pytest.mark.skipif(shutil.which('bash') is None or shutil.which('socat') is None,
+                    reason="bash or socat not available")
+def test_bash_completion_server(server):
+    command = _bash_server_command(server)
+    output = subprocess.run(['bash', '-c', command], capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ['fast', 'slow']
+    server.server_close()
+    output = subprocess.run(['bash', '-c', command], capture_output=True, text=True, check=True)
+    assert output.stdout.split() == ['fast', 'medium']
+
+
+@pytest.mark.skipif(shutil.which('bash') is None, reason="bash not available")
+def test_bash_completion_server_without_socat(server, tmp_path):
+    command = _bash_server_command(server)
+    assert 'python' not in command
+    # no socat in PATH, the static tables are used
+    output = subprocess.run([shutil.which('bash'), '-c', command], capture_output=True, text=True,
+                            check=True, env={'PATH': str(tmp_path)})
+    assert output.stdout.split() == ['fast', 'medium']
+
+
+def test_completion_server_rebuilds_table(tmp_path):
+
+    class Method(Plugin):
+        _plugins_storage = '_methods'
+        _is_plugin_factory = True
+
+        @classmethod
+        def _extend_user_input(cls, questions):
+            questions.generate_cases("method", {name: plugin.colt_user_input
+                                                for name, plugin in cls.plugins.items()})
+
+    class CIS(Method):
+        pass
+
+    with CompletionServer(str(tmp_path / 'colt.sock'), Method) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        assert request_completion(server.server_address, ['']).words == ('CIS',)
+
+        class TDDFT(Method):
+            pass
+
+        assert request_completion(server.server_address, ['']).words == ('CIS', 'TDDFT')
+        server.shutdown()
+        thread.join()
@@ -0,0 +1,41 @@
+import pytest
+#
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def imported_modules(code):
+    """names of all modules imported by `code`, using `python -X importtime`"""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return {line.rpartition('|')[2].strip() for line in output.stderr.splitlines()
+            if line.startswith('import time:')}
+
+
+def test_import_colt_is_lazy():
+    modules = imported_modules("import colt")
+    assert 'colt' in modules
+    assert not any(module.startswith('colt.') for module in modules)
+
+
+@pytest.mark.parametrize("code, unused", [
+    ("from colt import from_commandline", ('numpy', 'readline', 'multiprocessing',
+                                           'colt.ask', 'colt.plugins', 'colt.pluginloader')),
+    ("from colt import Plugin", ('numpy', 'readline', 'colt.pluginloader')),
+    ("from colt import Validator", ('numpy', 'colt.colt', 'colt.parser')),
+])
+def test_only_used_subsystems_are_imported(code, unused):
+    modules = imported_modules(code)
+    assert not modules.intersection(unused)
+
+
+def test_lazy_attributes():
+    import colt
+    assert colt.Colt.__module__ == 'colt.colt'
+    assert set(colt.__all__) <= set(dir(colt))
+    with pytest.raises(AttributeError):
+        colt.does_not_exist
@@ -0,0 +1,23 @@
+import math
+#
+from colt.lazyimport import LazyImport, LazyImportCreator, LazyImporter
+
+
+def test_lazy_importer_uses_callers_globals():
+    importer = LazyImporter({'_lazy_math': 'math'})
+    assert importer._callers_gloabals is globals()
+    importer.load()
+    assert globals().pop('_lazy_math') is math
+
+
+def test_lazy_import_loads_on_attribute_access():
+    module = LazyImport('math', local_name='_lazy_math')
+    assert module._callers_gloabals is globals()
+    assert module.pi == math.pi
+    assert globals().pop('_lazy_math') is math
+
+
+def test_lazy_import_creator():
+    with LazyImportCreator() as creator:
+        module = creator.lazy_import_as('math', '_lazy_math')
+    assert module._callers_gloabals is globals()
@@ -0,0 +1,91 @@
+import pytest
+#
+import gc
+#
+from colt import memory_report
+from colt.memory import share_duplicates
+from colt.questions import QuestionASTGenerator
+from colt.qform import QuestionForm
+from colt.validator import Validator
+
+
+@pytest.fixture
+def questions():
+    return """
+      natoms = 10 :: int
+
+      [qm]
+      basis = sto-3g :: str :: [sto-3g, 6-31g, cc-pvdz]
+
+      [mm]
+      basis = sto-3g :: str :: [sto-3g, 6-31g, cc-pvdz]
+
+      [method(cis)]
+      basis = sto-3g :: str :: [sto-3g, 6-31g, cc-pvdz]
+      [method(tddft)]
+      basis = sto-3g :: str :: [sto-3g, 6-31g, cc-pvdz]
+    """
+
+
+def test_memory_report_qform(questions):
+    qform = QuestionForm(questions)
+    report = memory_report(qform)
+    assert report.types['ConcreteQuestion'][0] == 6
+    # equal choices are shared on construction
+    assert report.types['Choices'][0] == 2
+    assert {'', 'qm', 'mm', 'method(cis)', 'method(tddft)'} <= set(report.blocks)
+    assert sum(report.blocks.values()) == report.total
+    assert report.duplicate_choices.count == 0
+    assert 'ConcreteQuestion' in str(report)
+
+
+def test_memory_report_ast_and_answers(questions):
+    assert memory_report(QuestionASTGenerator(questions)).types['Question'][0] == 6
+    answers = QuestionForm(questions, config={'': {'method': 'cis'}}).get_answers()
+    assert {'', 'qm', 'mm', 'method'} <= set(memory_report(answers).blocks)
+
+
+def test_share_duplicates(questions):
+    qform = QuestionForm(questions, config={'': {'method': 'cis'}})
+    before = memory_report(qform)
+    stats = share_duplicates(qform)
+    after = memory_report(qform)
+    assert stats.strings > 0
+    assert after.duplicate_choices.count == 0
+    assert after.duplicate_strings.count == 0
+    assert after.total < before.total
+    # the form still works
+    assert qform.get_answers()['qm']['basis'] == 'sto-3g'
+    qform.set_answer('qm::basis', 'cc-pvdz')
+    assert qform.get_answers()['qm']['basis'] == 'cc-pvdz'
+
+
+def test_shared_metadata_keeps_answers_separate(questions):
+    qform = QuestionForm(questions, config={'': {'method': 'cis'}})
+    qm, mm = qform['qm'].concrete['basis'], qform['mm'].concrete['basis']
+    assert qm.choices is mm.choices
+    assert qm.typ is mm.typ
+    qform.set_answer('qm::basis', 'cc-pvdz')
+    assert qform.get_answers()['mm']['basis'] == 'sto-3g'
+    # presets replace the shared choices only for one question
+    qm.preset('cc-pvdz', '[cc-pvdz, sto-3g]')
+    assert mm.choices.as_list() == ['sto-3g', '6-31g', 'cc-pvdz']
+
+
+def test_list_validators_share_element_validator():
+    qform = QuestionForm("""
+      a = 1, 2 :: list(int) :: 1, 2, 3
+      b = 2 :: list(int) :: 1, 2, 3
+    """)
+    assert qform[''].concrete['a']._value._validator is qform[''].concrete['b']._value._validator
+    qform.set_answer('b', '3')
+    assert qform.get_answers() == {'a': [1, 2], 'b': [3]}
+
+
+def test_unused_element_validators_are_released():
+    choices = 'unused_a, unused_b'
+    validator = Validator('list(str)', choices=choices)
+    assert len([key for key in Validator._element_validators if key[2] == choices]) == 1
+    del validator
+    gc.collect()
+    assert not any(key[2] == choices for key in Validator._element_validators)
@@ -0,0 +1,175 @@
+import pytest
+#
+import pickle
+#
+from colt.parser import get_commandline_parser, SysIterator
+from colt.parser import ArgumentParserError, AnswersNotDefinedError, HelpRequested, UsageRequested
+from colt.parser import InvalidValueError, TooFewArgumentsError, TooManyArgumentsError
+from colt.parser import LazyCase, UnknownOptionError
+
+
+@pytest.fixture
+def questions():
+    return """
+      nstates = :: int
+      factor = 1.0 :: float
+      factory = default :: str
+      screening = True :: bool
+      natoms = 10 :: int, alias=n
+
+      [method(tddft)]
+      roots = 4 :: int
+      [method(cis)]
+      singlets = 2 :: int
+    """
+
+
+def get_answers(questions, args):
+    parser = get_commandline_parser(questions)
+    return parser.get_answers(args=SysIterator(args))
+
+
+def test_parser_options(questions):
+    answers = get_answers(questions, ['3', '--factor', '2.5', '-n', '4', 'cis', '--singlets', '3'])
+    assert answers['nstates'] == 3
+    assert answers['factor'] == 2.5
+    assert answers['natoms'] == 4
+    assert answers['method'] == 'cis'
+    assert answers['method']['singlets'] == 3
+
+
+def test_parser_option_abbreviation(questions):
+    answers = get_answers(questions, ['3', '--nat', '4', '--scr', 'tddft', '--ro', '8'])
+    assert answers['natoms'] == 4
+    assert answers['screening'] is False
+    assert answers['method']['roots'] == 8
+
+
+def test_parser_option_ambiguous_abbreviation(questions):
+    parser = get_commandline_parser(questions)
+    assert parser.optional_args.get('--factor').name == '--factor'
+    with pytest.raises(ValueError):
+        parser.optional_args.get('--fac')
+    assert parser.optional_args.get('--unknown') is None
+    with pytest.raises(SystemExit):
+        parser.get_answers(args=SysIterator(['3', '--fac', '2.0', 'cis']))
+
+
+def test_parser_single_dash_long_options(questions):
+    args = ['3', '-factor', '2.5', 'cis', '-singlets', '3']
+    parser = get_commandline_parser(questions)
+    assert parser.optional_args.get('-factor') is None
+    _, error = parser.try_get_answers(args=SysIterator(args))
+    assert isinstance(error, UnknownOptionError)
+    # only enabled for the argparse compatible interface
+    parser = get_commandline_parser(questions, single_dash_long=True)
+    answers = parser.get_answers(args=SysIterator(args))
+    assert answers['factor'] == 2.5
+    assert answers['method']['singlets'] == 3
+
+
+def test_parser_help_rendered_lazily(questions):
+    parser = get_commandline_parser(questions, description="Example")
+    assert parser.formatter._is_parsed is False
+    parser.get_answers(args=SysIterator(['3', 'cis']))
+    assert parser.formatter._is_parsed is False
+    # help is cached
+    assert parser.help is parser.help
+    assert parser.help.startswith("Example")
+    # and updated with the settings
+    parser.formatter.update("Other")
+    assert parser.help.startswith("Other")
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_parser_parse_many(questions, processes):
+    parser = get_commandline_parser(questions)
+    results = parser.parse_many([['3', 'cis'], ['4', '--factor', '2.0', 'tddft'],
+                                 ['5', '--unknown', 'cis'], ['6', 'cis', '-h'], ['7', 'cis']],
+                                processes=processes)
+    assert results[0]['nstates'] == 3
+    assert results[0]['method']['singlets'] == 2
+    assert results[1]['factor'] == 2.0
+    assert results[1]['method'] == 'tddft'
+    assert isinstance(results[2], ArgumentParserError)
+    assert 'Cannot understand option --unknown' in results[2].message
+    assert results[3].kind == 'help'
+    # answers are reset between the parses
+    assert results[4]['nstates'] == 7
+    assert results[4]['factor'] == 1.0
+
+
+def test_parser_parse_many_independent_values():
+    parser = get_commandline_parser("lst = 1 2 :: ilist\nn = 1 :: int")
+    results = parser.parse_many([[], ['--n', '2'], []])
+    assert results[0]['lst'] is not results[1]['lst']
+    results[0]['lst'].append(9)
+    assert results[1]['lst'] == [1, 2]
+    assert results[2]['lst'] == [1, 2]
+    assert parser.parse_many([[]])[0]['lst'] == [1, 2]
+
+
+def test_parser_error_without_exit(questions, capsys):
+    parser = get_commandline_parser(questions)
+    with pytest.raises(ArgumentParserError) as error:
+        parser.get_answers(args=SysIterator(['3', 'cis', '3']), exit_on_error=False)
+    assert capsys.readouterr().out == ''
+    assert error.value.kind == 'error'
+    assert 'Too many arguments' in error.value.message
+    restored = pickle.loads(pickle.dumps(error.value))
+    assert restored.message == error.value.message
+
+
+@pytest.mark.parametrize("args, error_type", [
+    (['3', '--unknown', 'cis'], UnknownOptionError),
+    (['3', '--fac', '2.0', 'cis'], UnknownOptionError),
+    (['x', 'cis'], InvalidValueError),
+    (['3', 'ccsd'], InvalidValueError),
+    ([], TooFewArgumentsError),
+    (['3', 'cis', '4'], TooManyArgumentsError),
+    (['3', 'cis', '--help'], HelpRequested),
+    (['3', 'ccsd', '--help'], UsageRequested),
+])
+def test_parser_try_get_answers_errors(questions, capsys, args, error_type):
+    parser = get_commandline_parser(questions)
+    answers, error = parser.try_get_answers(args=SysIterator(args))
+    assert answers is None
+    assert type(error) is error_type
+    assert error._message is None
+    assert error.message
+    assert capsys.readouterr().out == ''
+
+
+def test_parser_help_and_usage_are_independent():
+    assert not issubclass(UsageRequested, HelpRequested)
+    assert issubclass(UsageRequested, ArgumentParserError)
+    assert issubclass(HelpRequested, ArgumentParserError)
+
+
+def test_parser_answers_not_defined_error(questions):
+    parser = get_commandline_parser(questions)
+    error = AnswersNotDefinedError(parser, {'': {'nstates': 'NotSet'}})
+    assert 'nstates = NotSet' in error.message
+    assert isinstance(pickle.loads(pickle.dumps(error)), AnswersNotDefinedError)
+
+
+def test_parser_cases_created_on_selection(questions):
+    parser = get_commandline_parser(questions + """
+      [method(cis)::basis(sto-3g)]
+      level = :: str :: low
+    """)
+    subparser = parser.children[0]
+    assert all(isinstance(case, LazyCase) for case in subparser.iter_cases())
+    assert 'tddft' in parser.help and 'cis' in parser.help
+    assert isinstance(subparser._options['tddft'], LazyCase)
+    #
+    answers = parser.get_answers(args=SysIterator(['3', 'cis', 'sto-3g']))
+    assert answers['method']['basis']['level'] == 'low'
+    assert isinstance(subparser._options['tddft'], LazyCase)
+    assert not isinstance(subparser._options['cis'], LazyCase)
+    # answers set while creating a case are kept on reset
+    parser.reset()
+    answers = parser.get_answers(args=SysIterator(['4', 'cis', 'sto-3g']))
+    assert answers['method']['basis']['level'] == 'low'
+    # all cases are created if requested
+    assert not any(isinstance(case, LazyCase) for case in subparser.cases.values())
@@ -1,7 +1,9 @@
 import pytest
 #
+import pickle
 from collections import namedtuple
 from colt import Plugin
+from colt.plugins import PluginStorage
 
 
 @pytest.fixture
@@ -38,3 +40,130 @@ def test_plugin_basics(plugin):
     assert base._methods.get("PluginTwo", None) == plugins.two
     assert base._methods.get("PluginThree", None) == plugins.three
     assert base._methods.get("PluginFour", None) == PluginFour
+
+
+def test_plugin_prefetch_lazy_imports(monkeypatch):
+    from colt.lazyimport import LazyImporter
+
+    class Method(Plugin):
+        _is_plugin_factory = True
+        _plugins_storage = '_prefetch_methods'
+        _user_input = "nstates = 2 :: int"
+
+        @classmethod
+        def _extend_user_input(cls, questions):
+            questions.generate_cases("method", {name: plugin.colt_user_input
+                                                for name, plugin in cls.plugins.items()})
+
+        @classmethod
+        def from_config(cls, config):
+            return cls.plugin_from_config(config['method'])
+
+    class One(Method):
+        _lazy_imports = LazyImporter({'_colorsys': 'colorsys'}, callers_globals=globals())
+
+        @classmethod
+        def from_config(cls, config):
+            return _colorsys.__name__  # noqa: F821
+
+    class Two(Method):
+        _lazy_imports = LazyImporter({'_wave': 'wave'}, callers_globals=globals())
+
+    importer = One._lazy_imports
+    monkeypatch.setattr('sys.argv', ['prog', 'One'])
+    assert Method.from_commandline(prefetch=True) == 'colorsys'
+    # started when 'One' was selected, loaded by from_config
+    assert importer._prefetch is not None
+    assert One._lazy_imports is None
+    assert Two._lazy_imports._prefetch is None
+    del globals()['_colorsys']
+
+
+def test_plugin_prefetch_matches_the_subparser(monkeypatch):
+    from colt.lazyimport import LazyImporter
+
+    class Method(Plugin):
+        _is_plugin_factory = True
+        _plugins_storage = '_prefetch_subparser_methods'
+        _user_input = "mode = :: str\n[mode(One)]\n[mode(fast)]"
+
+        @classmethod
+        def _extend_user_input(cls, questions):
+            questions.generate_cases("method", {name: plugin.colt_user_input
+                                                for name, plugin in cls.plugins.items()})
+
+        @classmethod
+        def from_config(cls, config):
+            return config['mode'].value, config['method'].value
+
+    class One(Method):
+        _lazy_imports = LazyImporter({'_colorsys': 'colorsys'}, callers_globals=globals())
+
+    class Two(Method):
+        _lazy_imports = LazyImporter({'_wave': 'wave'}, callers_globals=globals())
+
+    monkeypatch.setattr('sys.argv', ['prog', 'One', 'Two'])
+    assert Method.from_commandline(prefetch=True) == ('One', 'Two')
+    # 'One' of the mode subparser is not the plugin
+    assert One._lazy_imports._prefetch is None
+    assert Two._lazy_imports._prefetch is not None
+    Two._lazy_imports.load()
+    del globals()['_wave']
+
+
+def test_plugin_storage_resolve(plugin):
+    base, plugins = plugin
+
+    class Tddft(base):
+        _plugin_aliases = ('td', )
+
+    storage = base.plugins
+    assert isinstance(storage, PluginStorage)
+    assert storage.resolve('PluginOne') is plugins.one
+    assert storage.resolve('td') is Tddft
+    assert storage.resolve('TDDFT') is Tddft
+    assert storage.resolve('pluginth') is plugins.three
+    assert storage.resolve_name('TdD') == 'Tddft'
+    with pytest.raises(KeyError, match='ambiguous'):
+        storage.resolve('plugint')
+    with pytest.raises(KeyError, match='unknown'):
+        storage.resolve('cis')
+    # aliases are not inherited and removed with their plugin
+    assert storage.aliases == {'td': 'Tddft'}
+    del storage['Tddft']
+    assert storage.aliases == {}
+    with pytest.raises(KeyError):
+        storage.resolve('td')
+
+
+def test_plugin_storage_is_a_dict():
+    storage = PluginStorage({'One': 1, 'Two': 2}, aliases={'first': 'One'})
+    assert storage == {'One': 1, 'Two': 2}
+    assert list(storage) == ['One', 'Two']
+    copy = storage.copy()
+    assert isinstance(copy, PluginStorage) and copy.resolve('FIRST') == 1
+    assert pickle.loads(pickle.dumps(storage)).resolve('f') == 1
+    assert storage.pop('One') == 1
+    assert storage.pop('One', None) is None
+    storage.setdefault('Three', 3)
+    storage |= {'Four': 4}
+    assert storage.resolve('tw') == 2
+    assert storage.resolve('fo') == 4
+    with pytest.raises(KeyError):
+        storage.resolve('first')
+    storage.clear()
+    with pytest.raises(KeyError):
+        storage.resolve('tw')
+
+
+def test_plugin_storage_non_str_keys():
+    storage = PluginStorage({'One': 1, 2: 'two'})
+    assert storage.resolve(2) == 'two'
+    for key in (None, 3, 1.5):
+        with pytest.raises(KeyError):
+            storage.resolve(key)
+    storage[None] = 'none'
+    assert storage.resolve(None) == 'none'
+    del storage[None]
+    with pytest.raises(KeyError, match='unknown'):
+        storage.resolve('two')
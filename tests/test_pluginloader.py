@@ -0,0 +1,202 @@
+import pytest
+#
+import json
+import os
+import sys
+#
+from colt import PluginLoader
+from colt.colt import LazyImportsPrefetcher
+from colt.parser import SysIterator
+from colt.pluginloader import IgnorePattern, LazyPlugin, clear_module_cache
+from colt.qform import QuestionForm
+
+
+FACTORY = """
+from colt import Plugin
+
+IMPORTED = []
+
+
+class Method(Plugin):
+    _is_plugin_factory = True
+    _plugins_storage = '_methods'
+
+    @classmethod
+    def _extend_user_input(cls, questions):
+        questions.generate_cases("method", {name: plugin.colt_user_input
+                                            for name, plugin in cls.plugins.items()})
+"""
+
+PLUGIN = """
+from methods import Method, IMPORTED
+
+IMPORTED.append('{name}')
+
+
+class {name}(Method):
+    _user_input = "{name} = {value} :: int"
+
+    @classmethod
+    def from_config(cls, config):
+        return ('{name}', config['{name}'])
+"""
+
+
+@pytest.fixture
+def methods(tmp_path, monkeypatch):
+    lib = tmp_path / 'lib'
+    lib.mkdir()
+    (lib / 'methods.py').write_text(FACTORY)
+    monkeypatch.syspath_prepend(str(lib))
+    yield
+    sys.modules.pop('methods', None)
+    clear_module_cache()
+
+
+@pytest.fixture
+def folder(tmp_path, methods):
+    folder = tmp_path / 'plugins'
+    folder.mkdir()
+    for name, value in (('Cis', 1), ('Tddft', 2)):
+        (folder / f'{name.lower()}.py').write_text(PLUGIN.format(name=name, value=value))
+    return str(folder)
+
+
+def load_methods():
+    """fresh factory and module cache, as in a new process"""
+    clear_module_cache()
+    sys.modules.pop('methods', None)
+    import methods
+    return methods
+
+
+def test_manifest_lazy_plugins(folder):
+    PluginLoader(folder, manifest='plugins.json')
+    assert os.path.isfile(os.path.join(folder, 'plugins.json'))
+    methods = load_methods()
+    assert methods.IMPORTED == []
+    PluginLoader(folder, manifest='plugins.json')
+    assert methods.IMPORTED == []
+    assert all(isinstance(plugin, LazyPlugin) for plugin in methods.Method.plugins.values())
+    # questions are generated from the manifest
+    qform = QuestionForm(methods.Method.colt_user_input, config={'': {'method': 'Tddft'}})
+    assert methods.IMPORTED == []
+    # only the used plugin is imported
+    answers = qform.get_answers()
+    assert methods.Method.plugin_from_config(answers['method']) == ('Tddft', 2)
+    assert methods.IMPORTED == ['Tddft']
+    assert not isinstance(methods.Method.plugins['Tddft'], LazyPlugin)
+    assert isinstance(methods.Method.plugins['Cis'], LazyPlugin)
+
+
+def test_prefetch_does_not_load_lazy_plugins(folder):
+    PluginLoader(folder, manifest='plugins.json')
+    methods = load_methods()
+    PluginLoader(folder, manifest='plugins.json')
+    parser = methods.Method._get_commandline_parser()
+    with parser.on_case_selected(LazyImportsPrefetcher(methods.Method)):
+        answers = parser.get_answers(args=SysIterator(['Tddft']))
+    assert answers['method'] == 'Tddft'
+    assert methods.IMPORTED == []
+
+
+def test_manifest_changed_file(folder):
+    PluginLoader(folder, manifest='plugins.json')
+    with open(os.path.join(folder, 'cis.py'), 'a') as fhandle:
+        fhandle.write("\n# changed\n")
+    methods = load_methods()
+    PluginLoader(folder, manifest='plugins.json')
+    assert methods.IMPORTED == ['Cis']
+    assert isinstance(methods.Method.plugins['Tddft'], LazyPlugin)
+    # the manifest is up to date again
+    methods = load_methods()
+    PluginLoader(folder, manifest='plugins.json')
+    assert methods.IMPORTED == []
+
+
+def test_manifest_content(folder):
+    PluginLoader(folder, manifest='plugins.json')
+    with open(os.path.join(folder, 'plugins.json')) as fhandle:
+        manifest = json.load(fhandle)
+    entry = manifest['modules']['cis.py']
+    assert entry['plugins'] == [{'name': 'Cis', 'factory': 'methods:Method',
+                                 'user_input': 'Cis = 1 :: int', 'description': None,
+                                 'lazy': True}]
+
+
+def test_import_order_and_parallel_compile(tmp_path, methods, monkeypatch):
+    monkeypatch.setattr(sys, 'dont_write_bytecode', False)
+    folder = tmp_path / 'plugins'
+    (folder / 'c').mkdir(parents=True)
+    for path in ('b.py', 'a.py', 'c/c.py'):
+        name = path[0]
+        (folder / path).write_text(f"from methods import IMPORTED\nIMPORTED.append('{name}')\n")
+    methods = load_methods()
+    PluginLoader(str(folder), processes=2)
+    assert methods.IMPORTED == ['a', 'b', 'c']
+    assert os.path.isdir(folder / '__pycache__')
+    assert os.path.isdir(folder / 'c' / '__pycache__')
+
+
+IGNOREFILE = """
+unimportant_*.py # Ignore all python files that start with unimportant_
+**/ignore        # Ignore all folders that are named ignore
+**/sub/skip.py
+tools/*.py
+!tools/keep.py
+"""
+
+
+@pytest.mark.parametrize("path, ignored", [
+    ('plugin.py', False),
+    ('unimportant_a.py', True),
+    ('a/unimportant_b.py', True),
+    ('ignore', True),
+    ('a/b/ignore', True),
+    ('sub/skip.py', True),
+    ('a/sub/skip.py', True),
+    ('skip.py', False),
+    ('tools/a.py', True),
+    ('tools/keep.py', False),
+    ('a/tools/a.py', False),
+])
+def test_ignore_pattern(tmp_path, path, ignored):
+    (tmp_path / '.coltignore').write_text(IGNOREFILE)
+    folder = str(tmp_path)
+    pattern = IgnorePattern(folder, '.coltignore')
+    assert pattern(os.path.join(folder, path)) is ignored
+
+
+def test_ignored_folders_are_not_scanned(tmp_path, methods, monkeypatch):
+    (tmp_path / '.coltignore').write_text("**/ignore\n")
+    (tmp_path / 'ignore' / 'deep').mkdir(parents=True)
+    (tmp_path / 'ignore' / 'deep' / 'a.py').write_text("raise ValueError\n")
+    (tmp_path / 'b.py').write_text("from methods import IMPORTED\nIMPORTED.append('b')\n")
+    scanned = []
+    scandir = os.scandir
+
+    def _scandir(path):
+        scanned.append(os.path.basename(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', _scandir)
+    methods = load_methods()
+    PluginLoader(str(tmp_path), ignorefile='.coltignore')
+    assert methods.IMPORTED == ['b']
+    assert 'ignore' not in scanned and 'deep' not in scanned
+
+
+def test_files_are_imported_once(folder):
+    methods = load_methods()
+    PluginLoader(folder)
+    plugins = dict(methods.Method.plugins)
+    PluginLoader(folder)
+    assert methods.IMPORTED == ['Cis', 'Tddft']
+    assert methods.Method.plugins == plugins
+    # reload only executes changed files
+    with open(os.path.join(folder, 'cis.py'), 'a') as fhandle:
+        fhandle.write("\n# changed\n")
+    PluginLoader(folder, reload=True)
+    assert methods.IMPORTED == ['Cis', 'Tddft', 'Cis']
+    assert methods.Method.plugins['Cis'] is not plugins['Cis']
+    assert methods.Method.plugins['Tddft'] is plugins['Tddft']
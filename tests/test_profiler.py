@@ -0,0 +1,79 @@
+import pytest
+#
+import json
+import os
+import subprocess
+import sys
+#
+from colt import Colt, PluginLoader
+from colt import profiler
+from colt.qform import QuestionForm
+
+
+@pytest.fixture
+def active_profiler():
+    yield profiler.enable(report_at_exit=False)
+    profiler.disable()
+
+
+def test_profiler_disabled():
+    assert profiler.get_profiler() is None
+    with profiler.profile('nothing', 'test'):
+        pass
+
+
+def test_profiler_phases(active_profiler, tmp_path):
+    plugin = tmp_path / 'plugin.py'
+    plugin.write_text("value = 1\n")
+    PluginLoader(str(tmp_path))
+    QuestionForm("a = 1 :: int\n[b]\nc = 2 :: int")
+    summary = {(category, name): calls
+               for category, name, calls, _, _ in active_profiler.summary()}
+    assert summary[('import', str(plugin))] == 1
+    assert summary[('qform', 'QuestionASTGenerator')] == 1
+    assert summary[('qform', 'set_answers_and_presets')] == 1
+    assert 'QuestionGeneratorVisitor' in active_profiler.report()
+
+
+def test_profiler_chrome_trace(active_profiler, tmp_path):
+    QuestionForm("a = 1 :: int")
+    filename = tmp_path / 'trace.json'
+    active_profiler.write_chrome_trace(str(filename))
+    events = json.loads(filename.read_text())['traceEvents']
+    names = {event['name'] for event in events}
+    assert names >= {'QuestionASTGenerator', 'QuestionGeneratorVisitor'}
+    assert all(event['ph'] == 'X' for event in events)
+
+
+def test_profiler_reports_once():
+    code = "from colt import profiler; profiler.enable(); profiler.enable()"
+    env = dict(os.environ, COLT_PROFILE='1')
+    env.pop('COLT_PROFILE_OUTPUT', None)
+    output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True,
+                            text=True, check=True)
+    assert output.stderr.count("colt profile") == 1
+
+
+@pytest.mark.parametrize("code, reports", [
+    ("profiler.enable(); profiler.disable()", 0),
+    ("profiler.enable(); profiler.disable(); profiler.enable()", 1),
+])
+def test_profiler_disable_at_exit(code, reports):
+    code = "from colt import profiler; " + code
+    env = dict(os.environ)
+    env.pop('COLT_PROFILE', None)
+    env.pop('COLT_PROFILE_OUTPUT', None)
+    output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True,
+                            text=True, check=True)
+    assert output.stderr.count("colt profile") == reports
+
+
+def test_profiler_class_labels(active_profiler):
+
+    class Example(Colt):
+        _user_input = "a = 1 :: int"
+
+    Example.generate_user_input_ast()
+    summary = {(category, name) for category, name, _, _, _ in active_profiler.summary()}
+    assert ('class', f'{__name__}.Example') in summary
+    assert ('questions', f'{__name__}.Example') in summary
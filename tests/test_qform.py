@@ -0,0 +1,80 @@
+import pytest
+#
+import json
+from io import StringIO
+#
+from colt.qform import QuestionForm, write_json_lines
+
+
+@pytest.fixture
+def questions():
+    return """
+      value = 2 :: int :: [1, 2, 3]
+      ilist = 1 2 3 :: ilist_np
+      flist = 1.2 3.8 :: flist_np
+      _hidden = 10 :: int
+      optional = :: str, optional
+
+      [qm]
+      nqm = 100 :: int
+      nmm = 200 :: int
+
+      [examplecase(yes)]
+      a = 10
+      [examplecase(no)]
+      a = 666
+    """
+
+
+def test_write_json(questions):
+    qform = QuestionForm(questions, config={'': {'examplecase': 'no'}})
+    answers = json.loads(qform.json_visitor.visit(qform))
+    assert answers == {
+            'value': 2,
+            'ilist': [1, 2, 3],
+            'flist': [1.2, 3.8],
+            'qm': {'nqm': 100, 'nmm': 200},
+            'examplecase': {'__answer__': 'no', 'no': {'a': '666'}},
+    }
+
+
+def test_write_json_lines(questions):
+    qforms = (QuestionForm(questions, config={'': {'value': str(i)}}) for i in (1, 2, 3))
+    output = StringIO()
+    assert write_json_lines(qforms, output) == 3
+    lines = output.getvalue().splitlines()
+    assert [json.loads(line)['value'] for line in lines] == [1, 2, 3]
+
+
+def test_case_loader():
+    loaded = []
+
+    def _load():
+        loaded.append('cis')
+        return "singlets = 2 :: int\n[states]\nn = 3 :: int"
+
+    qform = QuestionForm("method = :: str\n[method(cis)]\n[method(tddft)]\nroots = 4 :: int")
+    qform.form.blocks['method'].set_case_loader('cis', _load)
+    qform.set_answer('method', 'tddft')
+    assert qform.get_answers()['method']['roots'] == 4
+    assert loaded == []
+    qform.set_answer('method', 'cis')
+    answers = qform.get_answers()
+    assert loaded == ['cis']
+    assert answers['method']['singlets'] == 2
+    assert answers['method']['states']['n'] == 3
+    assert qform['method(cis)::states']['n'].name == 'method(cis)::states::n'
+
+
+def test_case_loader_presets(capsys):
+    qform = QuestionForm("method = :: str\n[method(cis)]\n[method(tddft)]\nroots = 4 :: int")
+    qform.form.blocks['method'].set_case_loader(
+        'cis', lambda: "singlets = 2 :: int\n[states]\nn = 3 :: int")
+    qform.set_presets("[method(cis)]\nsinglets = 5\n[method(cis)::states]\nn = 6\n"
+                      "[method(tddft)]\nroots = 7")
+    assert qform['method(tddft)']['roots'].answer == 7
+    qform.set_answer('method', 'cis')
+    answers = qform.get_answers()
+    assert answers['method']['singlets'] == 5
+    assert answers['method']['states']['n'] == 6
+    assert capsys.readouterr().out == ''